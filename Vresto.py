@@ -18,8 +18,8 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ----------------------------------------------------------------------
 
-from vresto import app, __version__
+from vresto import main
 
 
 if __name__ == "__main__":
-    app.run(version=__version__)
+    main()
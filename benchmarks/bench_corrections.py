@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+"""
+Compares the batch CorrectionsModel methods against the per-call loop.
+
+Usage: python -m benchmarks.bench_corrections [--points N] [--repeat R]
+"""
+
+import argparse
+import time
+import numpy as np
+
+from vresto.model.corrections_model import CorrectionsModel
+
+
+def _best_of(method, repeat: int) -> float:
+    """Runs the method repeat times and returns the best time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        method()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(points: int, repeat: int) -> bool:
+    """Runs the benchmark for all the materials, returns False if any result differs from the scalar methods."""
+    rng = np.random.default_rng(seed=0)
+    virtual = rng.uniform(-5.0, 5.0, points)
+    diamond = virtual + rng.uniform(0.0, 2.0, points)
+
+    model = CorrectionsModel()
+    identical = True
+
+    for material in model.materials():
+        model.refraction_index = material
+
+        def loop() -> tuple:
+            thickness = [
+                model.get_diamond_thickness(v, d)
+                for v, d in zip(virtual.tolist(), diamond.tolist())
+            ]
+            position = [
+                model.get_diamond_position(v, t)
+                for v, t in zip(virtual.tolist(), thickness)
+            ]
+            real = [model.get_real_position(t, p) for t, p in zip(thickness, position)]
+            return thickness, position, real
+
+        def batch() -> tuple:
+            thickness = model.get_diamond_thickness_array(virtual, diamond)
+            position = model.get_diamond_position_array(virtual, thickness)
+            real = model.get_real_position_array(thickness, position)
+            return thickness, position, real
+
+        for scalar, array in zip(loop(), batch()):
+            if not np.array_equal(np.asarray(scalar), array):
+                identical = False
+
+        loop_time = _best_of(loop, repeat)
+        batch_time = _best_of(batch, repeat)
+        print(
+            f"{material:<14} points={points:<8} loop={loop_time * 1e3:9.3f} ms  "
+            f"batch={batch_time * 1e3:9.3f} ms  speedup={loop_time / batch_time:7.1f}x"
+        )
+
+    print(f"Results identical to the scalar methods: {identical}")
+    return identical
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+
+    raise SystemExit(0 if run(points=arguments.points, repeat=arguments.repeat) else 1)
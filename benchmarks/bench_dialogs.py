@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+"""
+Measures the cost of showing an error: a new message box with its own inline
+stylesheet for every error (before), against the shared message box styled by
+the application stylesheet (after).
+
+Usage: QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_dialogs [--iterations N]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from qtpy.QtWidgets import QApplication, QMessageBox
+
+from vresto.model import PathModel
+from vresto.widget.custom import MsgBox
+
+# The inline stylesheet every message box used to parse
+_inline_stylesheet = (
+    "QMessageBox, QMessageBox * {background: #222a35; color: #afabab;}"
+    "QPushButton {background: #344152; color: #e6e6e6; border: 1px solid #e6e6e6;"
+    "font-family: 'Times New Roman'; font-size: 16px; border-radius: 4px;"
+    "padding: 5px 20px;}"
+    "QPushButton:hover, QPushButton:focus {background: #e6e6e6; color: #344152;}"
+)
+
+
+def _legacy_error(application: QApplication, msg: str) -> None:
+    box = QMessageBox()
+    box.setStyleSheet(_inline_stylesheet)
+    box.setIcon(QMessageBox.Critical)
+    box.setText(msg)
+    box.show()
+    application.processEvents()
+    box.hide()
+    box.deleteLater()
+
+
+def _shared_error(application: QApplication, msg: str) -> None:
+    box = MsgBox.shared()
+    box.notify(msg)
+    application.processEvents()
+    box.hide()
+
+
+def run(iterations: int) -> None:
+    application = QApplication.instance() or QApplication(sys.argv)
+    application.setStyleSheet(PathModel().stylesheet("main.qss"))
+
+    for label, method in (("before", _legacy_error), ("after", _shared_error)):
+        timings = []
+        for index in range(iterations):
+            start = time.perf_counter()
+            method(application, f"Could not connect PV {index}")
+            timings.append(time.perf_counter() - start)
+        print(
+            f"{label:<8} first={timings[0] * 1e3:8.3f} ms  "
+            f"median={statistics.median(timings) * 1e3:8.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=100)
+    arguments = parser.parse_args()
+
+    run(iterations=arguments.iterations)
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+"""
+Checks that importing the package stays cheap and free of side effects.
+
+Every module is imported in a fresh interpreter, the best import time of a few runs
+is compared with the budget, and the import must not pull in Qt or pyepics. Exits
+with a non-zero status if any module fails the check.
+
+Usage: python -m benchmarks.bench_import_time [--budget SECONDS] [--repeat R]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+# Modules that must import without Qt or pyepics, and their heavy dependencies
+_modules = ("vresto", "vresto.model", "vresto.model.notification_model")
+_forbidden = ("qtpy", "PyQt5", "epics", "numpy")
+# Import time budget in seconds
+_budget = 0.05
+
+_probe = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"time": elapsed, "modules": [m for m in {forbidden!r} if m in sys.modules]}}))
+"""
+
+
+def _measure(module: str) -> dict:
+    """Imports the module in a fresh interpreter and returns the time and the heavy modules imported."""
+    output = subprocess.run(
+        [sys.executable, "-c", _probe.format(module=module, forbidden=_forbidden)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(budget: float, repeat: int) -> bool:
+    passed = True
+
+    for module in _modules:
+        results = [_measure(module) for _ in range(repeat)]
+        best = min(result["time"] for result in results)
+        imported = sorted({name for result in results for name in result["modules"]})
+
+        ok = best <= budget and not imported
+        passed &= ok
+        print(
+            f"{module:<36} {best * 1e3:8.2f} ms  budget={budget * 1e3:.0f} ms  "
+            f"heavy imports={imported or '-'}  {'OK' if ok else 'FAIL'}"
+        )
+
+    return passed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget", type=float, default=_budget)
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+
+    raise SystemExit(0 if run(budget=arguments.budget, repeat=arguments.repeat) else 1)
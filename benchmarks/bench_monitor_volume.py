@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+"""
+Measures how many monitor callbacks a moving motor generates for the readback with
+the default subscription (before) and with the subscription profiles and deadbands
+(after). All the subscriptions watch the same motions.
+
+Usage: python -m benchmarks.bench_monitor_volume --pv MOTOR [--moves N] [--step S] [--deadband D ...]
+
+The motor is moved back and forth by step, its readback is MOTOR.RBV.
+"""
+
+import argparse
+import time
+from epics import caget, get_pv
+
+from vresto.model.pv_model import PVModel, subscription_profiles
+
+
+def run(pv: str, moves: int, step: float, deadbands: list) -> None:
+    readback = pv + ".RBV"
+    subscriptions = {"default": get_pv(readback)}
+    for role, profile in subscription_profiles.items():
+        name = PVModel._filtered_name(readback, profile.deadband)
+        subscriptions[role] = get_pv(name, auto_monitor=profile.mask)
+    for deadband in deadbands:
+        name = PVModel._filtered_name(readback, deadband)
+        subscriptions[f"dbnd {deadband:g}"] = get_pv(name)
+
+    counts = dict.fromkeys(subscriptions, 0)
+    for label, channel in subscriptions.items():
+        channel.wait_for_connection()
+
+        def count(label=label, **kwargs) -> None:
+            counts[label] += 1
+
+        channel.add_callback(count)
+
+    time.sleep(0.5)
+    counts = dict.fromkeys(subscriptions, 0)
+
+    start = caget(pv)
+    for index in range(moves):
+        target = start + (step if index % 2 == 0 else 0.0)
+        get_pv(pv).put(target, wait=True)
+    time.sleep(0.5)
+
+    baseline = max(counts["default"], 1)
+    for label, events in counts.items():
+        print(f"{label:<14} callbacks={events:<8} {events / baseline:7.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pv", required=True, help="motor record PV name")
+    parser.add_argument("--moves", type=int, default=10)
+    parser.add_argument("--step", type=float, default=1.0)
+    parser.add_argument("--deadband", type=float, nargs="*", default=[0.001, 0.01])
+    arguments = parser.parse_args()
+
+    run(
+        pv=arguments.pv,
+        moves=arguments.moves,
+        step=arguments.step,
+        deadbands=arguments.deadband,
+    )
@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+"""
+Measures the time to issue a DoubleValuePV move, with the soft limits read through
+caget on every call (before) and with the limits cached from the monitors (after).
+
+Usage: python -m benchmarks.bench_move_latency --pv MOTOR [--iterations N] [--put]
+
+Without --put the target is above the high limit, so only the limit check is timed.
+With --put the current position of the motor is written back, so the motor record
+receives a put but does not move.
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import Future
+from epics import caget, caput
+
+from vresto.model.pv_model import DoubleValuePV
+
+
+def _report(label: str, timings: list) -> None:
+    """Prints the median and 99th percentile of the timings in microseconds."""
+    timings = sorted(timings)
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(
+        f"{label:<8} median={statistics.median(timings) * 1e6:10.1f} us  "
+        f"p99={p99 * 1e6:10.1f} us"
+    )
+
+
+def _wait_for_limits(stage: DoubleValuePV, timeout: float) -> None:
+    """Waits for the soft limits, they arrive from the monitors after the PV is created."""
+    deadline = time.monotonic() + timeout
+    while stage._low_limit is None or stage._high_limit is None:
+        if time.monotonic() > deadline:
+            raise SystemExit(f"The soft limits of {stage.pv} did not arrive")
+        time.sleep(0.01)
+
+
+def run(pv: str, iterations: int, put: bool) -> None:
+    stage = DoubleValuePV(pv=pv, movable=True, limited=True, name=pv)
+    _wait_for_limits(stage, timeout=5.0)
+    # Without put the target is above the high limit, so move only checks the limits
+    target = caget(pv) if put else stage.high_limit + 1.0
+
+    def legacy_issue() -> None:
+        if target < caget(pv + ".LLM") or target > caget(pv + ".HLM"):
+            return None
+        if put:
+            caput(pv, target)
+
+    def cached_issue() -> Future:
+        return stage.move(target)
+
+    for label, method in (("before", legacy_issue), ("after", cached_issue)):
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            motion = method()
+            timings.append(time.perf_counter() - start)
+            # Wait outside of the timing, so every move is sent instead of queued
+            if motion is not None:
+                motion.result(timeout=30.0)
+        _report(label, timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pv", required=True, help="motor record PV name")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--put", action="store_true")
+    arguments = parser.parse_args()
+
+    run(pv=arguments.pv, iterations=arguments.iterations, put=arguments.put)
@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+"""
+Measures the GUI load of fast readbacks: a signal per CA event (before) against the
+shared readback mailbox drained at a fixed rate (after). A thread publishes the
+readbacks of a number of moving motors as fast as the CA thread would.
+
+Usage: QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_readback [--motors N] [--rate HZ] [--duration S]
+"""
+
+import argparse
+import sys
+import threading
+import time
+from qtpy.QtCore import QObject, QTimer, Signal
+from qtpy.QtWidgets import QApplication, QLabel
+
+from vresto.model import DoubleValuePV, ReadbackMailboxModel
+from vresto.widget.custom import QReadback
+
+
+class _LegacyReadback(QLabel):
+    """Label updated by a queued signal for every readback."""
+
+    _readback_received: Signal = Signal(object)
+
+    def __init__(self, pv: DoubleValuePV) -> None:
+        super(_LegacyReadback, self).__init__("----")
+        self._readback_received.connect(self._display)
+        pv.add_readback_callback(self._readback_received.emit)
+
+    def _display(self, value: float) -> None:
+        self.setText(f"{value:.4f}")
+
+
+class _Counter(QObject):
+    """Counts the label updates."""
+
+    def __init__(self, labels: list) -> None:
+        super(_Counter, self).__init__()
+        self.updates = 0
+        for label in labels:
+            label.installEventFilter(self)
+
+    def eventFilter(self, watched, event) -> bool:
+        # Every setText with a new text schedules a repaint
+        if event.type() == event.UpdateRequest or event.type() == event.Paint:
+            self.updates += 1
+        return False
+
+
+def _publish(pvs: list, rate: float, duration: float) -> int:
+    """Publishes moving readbacks for all the PVs, returns the number of events."""
+    events = 0
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        position = time.perf_counter() - start
+        for pv in pvs:
+            pv._monitor_pv(value=position, timestamp=time.time())
+            events += 1
+        time.sleep(interval)
+    return events
+
+
+def _measure(
+    application: QApplication, label_class, motors: int, rate: float, duration: float
+) -> None:
+    pvs = [
+        DoubleValuePV(pv=f"BENCH:m{index}", movable=False, limited=False, monitor=False)
+        for index in range(motors)
+    ]
+    labels = [label_class(pv) for pv in pvs]
+    for label in labels:
+        label.show()
+    counter = _Counter(labels)
+    application.processEvents()
+
+    result = {}
+    publisher = threading.Thread(
+        target=lambda: result.update(events=_publish(pvs, rate, duration))
+    )
+    cpu = time.process_time()
+    publisher.start()
+    QTimer.singleShot(round(duration * 1000) + 100, application.quit)
+    application.exec()
+    publisher.join()
+    cpu = time.process_time() - cpu
+
+    print(
+        f"{label_class.__name__.lstrip('_'):<16} events={result['events']:<8} "
+        f"paints={counter.updates:<8} cpu={cpu:6.3f} s"
+    )
+
+    for label in labels:
+        label.close()
+        label.deleteLater()
+    application.processEvents()
+
+
+def run(motors: int, rate: float, duration: float) -> None:
+    application = QApplication.instance() or QApplication(sys.argv)
+    mailbox = ReadbackMailboxModel.shared()
+
+    _measure(application, _LegacyReadback, motors, rate, duration)
+    _measure(application, QReadback, motors, rate, duration)
+    print(f"mailbox          posted={mailbox.posted:<8} delivered={mailbox.deliveries}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--motors", type=int, default=20)
+    parser.add_argument("--rate", type=float, default=500.0)
+    parser.add_argument("--duration", type=float, default=3.0)
+    arguments = parser.parse_args()
+
+    run(motors=arguments.motors, rate=arguments.rate, duration=arguments.duration)
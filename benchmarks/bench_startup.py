@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+"""
+Measures the startup phases of Vresto.py and fails when a phase regresses.
+
+The application is started with VRESTO_STARTUP_PROFILE set, so it writes its
+startup phases to a JSON file and exits once the window is painted and EPICS is
+ready. The best time of every phase is compared with the absolute thresholds
+below, or with a baseline file times the tolerance.
+
+Usage: python -m benchmarks.bench_startup [--repeat R] [--baseline FILE]
+       [--tolerance T] [--save FILE]
+
+Set QT_QPA_PLATFORM=offscreen to run without a display.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+_entry_point = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Vresto.py")
+
+# Absolute thresholds in seconds, used when no baseline is given
+_thresholds = {
+    "import": 1.0,
+    "qapplication": 0.5,
+    "widget": 0.5,
+    "version": 0.5,
+    "first paint": 0.5,
+    "epics ready": 5.0,
+}
+
+
+def _measure(timeout: float) -> dict:
+    """Starts the application once and returns its startup phases."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "startup.json")
+        environment = dict(os.environ, VRESTO_STARTUP_PROFILE=path)
+        process = subprocess.run(
+            [sys.executable, _entry_point],
+            env=environment,
+            timeout=timeout,
+            capture_output=True,
+            text=True,
+        )
+        if not os.path.exists(path):
+            raise RuntimeError(
+                f"Vresto.py exited with {process.returncode} before reporting "
+                f"the startup phases:\n{process.stderr[-2000:]}"
+            )
+        with open(path, "r") as file:
+            return json.load(file)["phases"]
+
+
+def run(repeat: int, baseline: str, tolerance: float, save: str) -> bool:
+    runs = [_measure(timeout=60.0) for _ in range(repeat)]
+    best = {name: min(phases[name] for phases in runs) for name in runs[0]}
+
+    thresholds = dict(_thresholds)
+    if baseline:
+        with open(baseline, "r") as file:
+            thresholds = {
+                name: value * tolerance for name, value in json.load(file).items()
+            }
+
+    passed = True
+    for name, value in best.items():
+        threshold = thresholds.get(name)
+        ok = threshold is None or value <= threshold
+        passed &= ok
+        limit = f"{threshold * 1e3:9.1f} ms" if threshold is not None else "        -"
+        print(
+            f"{name:<14} {value * 1e3:9.1f} ms  threshold={limit}  {'OK' if ok else 'FAIL'}"
+        )
+
+    if save:
+        with open(save, "w") as file:
+            json.dump(best, file, indent=2)
+
+    return passed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default="", help="JSON file saved with --save")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--save", default="", help="write the best phases to JSON")
+    arguments = parser.parse_args()
+
+    raise SystemExit(
+        0
+        if run(
+            repeat=arguments.repeat,
+            baseline=arguments.baseline,
+            tolerance=arguments.tolerance,
+            save=arguments.save,
+        )
+        else 1
+    )
@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+"""
+Measures the paint cost of a panel of toggle switches: drawing the track and thumb
+on every paint (before) against blitting the cached pixmaps (after).
+
+Usage: QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_switch [--switches N] [--frames N]
+"""
+
+import argparse
+import sys
+import time
+from qtpy.QtGui import QPainter
+from qtpy.QtCore import Qt
+from qtpy.QtWidgets import QApplication, QGridLayout, QWidget
+
+from vresto.widget.custom.q_switch import QSwitch
+
+
+class _LegacySwitch(QSwitch):
+    """Switch that draws the track and thumb on every paint."""
+
+    def paintEvent(self, event) -> None:
+        track_brush, thumb_brush, track_opacity = self._brushes()
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(track_brush)
+        painter.setOpacity(track_opacity)
+        painter.drawRoundedRect(
+            self._margin,
+            self._margin,
+            self.width() - 2 * self._margin,
+            self.height() - 2 * self._margin,
+            self._track_radius,
+            self._track_radius,
+        )
+        painter.setBrush(thumb_brush)
+        painter.setOpacity(1.0)
+        painter.drawEllipse(
+            round(self._offset - self._thumb_radius),
+            self._base_offset - self._thumb_radius,
+            2 * self._thumb_radius,
+            2 * self._thumb_radius,
+        )
+
+
+def _measure(
+    application: QApplication, switch_class, switches: int, frames: int
+) -> float:
+    panel = QWidget()
+    layout = QGridLayout(panel)
+    panel_switches = [switch_class(panel) for _ in range(switches)]
+    for index, switch in enumerate(panel_switches):
+        layout.addWidget(switch, index // 10, index % 10)
+    panel.show()
+    application.processEvents()
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        # Every frame moves the thumbs, as the toggle animation does
+        for switch in panel_switches:
+            switch.offset = switch._end_offset[frame % 2 == 0]()
+        panel.repaint()
+    elapsed = time.perf_counter() - start
+
+    panel.close()
+    panel.deleteLater()
+    return elapsed / frames
+
+
+def run(switches: int, frames: int) -> None:
+    application = QApplication.instance() or QApplication(sys.argv)
+
+    for label, switch_class in (("before", _LegacySwitch), ("after", QSwitch)):
+        frame = _measure(application, switch_class, switches, frames)
+        print(f"{label:<8} {switches} switches: {frame * 1e3:8.3f} ms per frame")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--switches", type=int, default=100)
+    parser.add_argument("--frames", type=int, default=200)
+    arguments = parser.parse_args()
+
+    run(switches=arguments.switches, frames=arguments.frames)
@@ -0,0 +1,290 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+"""
+Benchmark suite of the PV, correction and GUI hot paths, run against the simulated
+transport so that no IOC is needed.
+
+The results are written as JSON, and can be compared with the results of a previous
+run: times (s, ms, us) regress when they grow and rates (per_s) when they drop by
+more than the tolerance.
+
+Usage: python -m benchmarks.suite [--output FILE] [--baseline FILE] [--tolerance T]
+       [--quick]
+
+--quick divides every size by 10, with the same metric names, so only compare it
+with a baseline that was also run with --quick. The GUI benchmark runs with the
+offscreen Qt platform unless QT_QPA_PLATFORM is set.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+from enum import Enum
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import vresto
+from vresto.model import (
+    CorrectionsModel,
+    DoubleValuePV,
+    EpicsModel,
+    ReadbackMailboxModel,
+    SimTransportModel,
+    channel_pool,
+)
+
+
+def _use_simulation() -> SimTransportModel:
+    """Replaces the transport of the channel pool with a new simulated one."""
+    channel_pool.finalize(timeout=1.0)
+    transport = SimTransportModel()
+    channel_pool.transport = transport
+    return transport
+
+
+def _wait(condition, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("The simulated transport did not respond in time")
+        time.sleep(0.001)
+
+
+def bench_connect(counts: dict) -> dict:
+    """Time of EpicsModel.connect for the numbers of PVs, by size name."""
+    results = {}
+    for size, count in counts.items():
+        _use_simulation()
+        config = Enum(
+            f"BenchConfig{count}",
+            {
+                f"motor_{index}": f"BENCH:connect{count}:m{index}"
+                for index in range(count)
+            },
+        )
+        epics = EpicsModel(config=config, timeout=30.0)
+
+        start = time.perf_counter()
+        status = epics.connect()
+        results[f"{size}_s"] = time.perf_counter() - start
+
+        if not all(status.values()):
+            raise RuntimeError(f"Only {sum(status.values())} of {count} PVs connected")
+        epics.disconnect()
+    return results
+
+
+def bench_move(iterations: int) -> dict:
+    """Time to issue a DoubleValuePV move, with the limit check."""
+    _use_simulation()
+    stage = DoubleValuePV(
+        pv="BENCH:move", movable=True, limited=True, rbv_extension=True, monitor=True
+    )
+    _wait(lambda: stage.connected and stage._high_limit is not None)
+
+    timings = []
+    for index in range(iterations):
+        start = time.perf_counter()
+        motion = stage.move(0.001 * (index % 2), retarget=True)
+        timings.append(time.perf_counter() - start)
+    motion.result(timeout=10.0)
+
+    timings.sort()
+    return {
+        "median_us": statistics.median(timings) * 1e6,
+        "p99_us": timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1e6,
+    }
+
+
+def bench_monitor(events: int) -> dict:
+    """Rate of monitor events delivered into the readback of a DoubleValuePV."""
+    _use_simulation()
+    stage = DoubleValuePV(
+        pv="BENCH:monitor",
+        movable=False,
+        limited=False,
+        rbv_extension=True,
+        monitor=True,
+    )
+    _wait(lambda: stage.connected)
+
+    received = threading.Event()
+    readbacks = []
+
+    def count(value: float) -> None:
+        readbacks.append(value)
+        if len(readbacks) == events:
+            received.set()
+
+    stage.add_readback_callback(count)
+    writer = channel_pool.acquire("BENCH:monitor.RBV")
+    _wait(lambda: writer.connected)
+
+    start = time.perf_counter()
+    for index in range(1, events + 1):
+        writer.put(index * 0.001)
+    if not received.wait(timeout=30.0):
+        raise TimeoutError(f"Only {len(readbacks)} of {events} readbacks arrived")
+    elapsed = time.perf_counter() - start
+
+    channel_pool.release(writer)
+    return {"events_per_s": events / elapsed}
+
+
+def bench_corrections(size: int, repeat: int) -> dict:
+    """Rate of the batch corrections, thickness, position and real position."""
+    corrections = CorrectionsModel()
+    virtual_positions = np.linspace(-5.0, 5.0, size)
+    diamond_positions = virtual_positions + 1.5
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        thicknesses = corrections.get_diamond_thickness_array(
+            virtual_positions, diamond_positions
+        )
+        positions = corrections.get_diamond_position_array(
+            virtual_positions, thicknesses
+        )
+        corrections.get_real_position_array(thicknesses, positions)
+        timings.append(time.perf_counter() - start)
+    return {"positions_per_s": size / min(timings)}
+
+
+def bench_gui(readbacks: int, frames: int) -> dict:
+    """Time to deliver a frame of new readbacks to QReadback labels and repaint them."""
+    from qtpy.QtWidgets import QApplication, QGridLayout, QWidget
+    from vresto.widget.custom import QReadback
+
+    application = QApplication.instance() or QApplication(sys.argv)
+    mailbox = ReadbackMailboxModel.shared()
+
+    pvs = [
+        DoubleValuePV(pv=f"BENCH:gui{index}", movable=False, limited=False)
+        for index in range(readbacks)
+    ]
+    panel = QWidget()
+    layout = QGridLayout(panel)
+    for index, pv in enumerate(pvs):
+        layout.addWidget(QReadback(pv), index // 10, index % 10)
+    panel.show()
+    application.processEvents()
+
+    timings = []
+    for frame in range(frames):
+        for pv in pvs:
+            pv._set_readback(round(frame * 0.001, 4), time.time())
+        start = time.perf_counter()
+        mailbox.drain()
+        panel.repaint()
+        timings.append(time.perf_counter() - start)
+
+    panel.close()
+    del panel, layout
+    return {"frame_ms": statistics.median(timings) * 1e3}
+
+
+def run(quick: bool) -> dict:
+    scale = 10 if quick else 1
+    # Every size is scaled the same way, and the metric names do not depend on it
+    connect_counts = {
+        "small": 10 // scale or 1,
+        "medium": 100 // scale,
+        "large": 1000 // scale,
+        "huge": 5000 // scale,
+    }
+    benchmarks = {
+        "connect": lambda: bench_connect(connect_counts),
+        "move": lambda: bench_move(iterations=2000 // scale),
+        "monitor": lambda: bench_monitor(events=20000 // scale),
+        "corrections": lambda: bench_corrections(size=1_000_000 // scale, repeat=5),
+        "gui": lambda: bench_gui(readbacks=100, frames=200 // scale),
+    }
+
+    results = {}
+    for name, benchmark in benchmarks.items():
+        results[name] = benchmark()
+        for metric, value in results[name].items():
+            print(f"{name:<12} {metric:<16} {value:14.3f}")
+    channel_pool.finalize(timeout=1.0)
+
+    return {
+        "version": vresto.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "quick": quick,
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> bool:
+    """Compares the results with the baseline, prints and returns whether all passed."""
+    passed = True
+    if report.get("quick") != baseline.get("quick"):
+        print("The report and the baseline were not run with the same --quick setting")
+    for name, metrics in report["results"].items():
+        for metric, value in metrics.items():
+            reference = baseline["results"].get(name, {}).get(metric)
+            if reference is None:
+                continue
+            if metric.endswith("_per_s"):
+                ok = value >= reference / tolerance
+            else:
+                ok = value <= reference * tolerance
+            passed &= ok
+            print(
+                f"{name:<12} {metric:<16} {value:14.3f}  baseline={reference:14.3f}  "
+                f"{'OK' if ok else 'FAIL'}"
+            )
+    return passed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default="", help="write the results to JSON")
+    parser.add_argument(
+        "--baseline", default="", help="JSON file written with --output"
+    )
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--quick", action="store_true", help="smaller sizes")
+    arguments = parser.parse_args()
+
+    report = run(quick=arguments.quick)
+
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    passed = True
+    if arguments.baseline:
+        with open(arguments.baseline, "r") as file:
+            passed = compare(report, json.load(file), arguments.tolerance)
+
+    raise SystemExit(0 if passed else 1)
@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtCore import QCoreApplication
+
+from vresto.model import SimTransportModel, channel_pool
+
+
+@pytest.fixture(scope="session")
+def application() -> QCoreApplication:
+    """The Qt application, needed to deliver the signals and run the timers."""
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def sim() -> SimTransportModel:
+    """Replaces the transport of the channel pool with a new simulated one."""
+    channel_pool.finalize(timeout=1.0)
+    transport = SimTransportModel()
+    channel_pool.transport = transport
+    yield transport
+    channel_pool.finalize(timeout=1.0)
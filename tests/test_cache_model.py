@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import json
+
+from vresto.model import PVCacheModel
+
+
+def test_saved_values_are_loaded_back(tmp_path) -> None:
+    path = str(tmp_path / "vresto" / "pv_cache.json")
+    snapshots = [
+        {"pv": "SIM:m1", "readback": 1.25, "timestamp": 10.0, "low_limit": -5.0},
+        {"pv": "SIM:mode", "readback": "Auto", "timestamp": 11.0},
+    ]
+    PVCacheModel(path=path).save(snapshots)
+
+    cache = PVCacheModel(path=path)
+    assert cache.load() == 2
+    assert cache.get("SIM:m1") == snapshots[0]
+    assert cache.get("SIM:mode") == snapshots[1]
+    assert cache.get("SIM:m2") is None
+
+
+def test_save_keeps_the_pvs_that_were_not_updated(tmp_path) -> None:
+    cache = PVCacheModel(path=str(tmp_path / "pv_cache.json"))
+    cache.save([{"pv": "SIM:m1", "readback": 1.0}, {"pv": "SIM:m2", "readback": 2.0}])
+    cache.save([{"pv": "SIM:m1", "readback": 3.0}])
+
+    reloaded = PVCacheModel(path=cache.path)
+    reloaded.load()
+    assert reloaded.get("SIM:m1")["readback"] == 3.0
+    assert reloaded.get("SIM:m2")["readback"] == 2.0
+
+
+def test_a_missing_or_broken_file_is_ignored(tmp_path) -> None:
+    cache = PVCacheModel(path=str(tmp_path / "pv_cache.json"))
+    assert cache.load() == 0
+
+    with open(cache.path, "w") as file:
+        file.write("{not json")
+    assert cache.load() == 0
+
+    with open(cache.path, "w") as file:
+        json.dump({"saved": 0.0}, file)
+    assert cache.load() == 0
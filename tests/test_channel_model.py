@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import gc
+
+import pytest
+from epics import dbr
+
+from vresto.model import DoubleValuePV, channel_pool, metrics
+from vresto.model.channel_model import filtered_name, parse_filtered_name
+
+from tests import wait_for
+
+
+def test_the_channel_is_released_with_the_last_reference(sim) -> None:
+    first = channel_pool.acquire("SIM:m1.RBV")
+    second = channel_pool.acquire("SIM:m1.RBV")
+
+    assert first is second
+    assert channel_pool.references == {"SIM:m1.RBV": 2}
+    assert wait_for(lambda: first.connected)
+
+    channel_pool.release(first)
+    assert channel_pool.references == {"SIM:m1.RBV": 1}
+    assert first.connected
+
+    channel_pool.release(second)
+    assert channel_pool.channels == 0
+    assert not first.connected
+
+
+def test_every_event_mask_has_its_own_channel(sim) -> None:
+    value = channel_pool.acquire("SIM:m1.RBV", mask=dbr.DBE_VALUE)
+    log = channel_pool.acquire("SIM:m1.RBV", mask=dbr.DBE_LOG)
+
+    assert value is not log
+    assert channel_pool.channels == 2
+    assert channel_pool.references == {"SIM:m1.RBV": 2}
+
+
+def test_the_pvs_share_the_channels_until_they_are_deleted(sim) -> None:
+    stages = [
+        DoubleValuePV(pv="SIM:m1", movable=True, limited=True, monitor=True)
+        for _ in range(2)
+    ]
+    references = channel_pool.references
+
+    assert channel_pool.channels == len(references)
+    assert set(references.values()) == {2}
+
+    del stages[0]
+    gc.collect()
+    assert set(channel_pool.references.values()) == {1}
+
+    del stages[0]
+    gc.collect()
+    assert channel_pool.channels == 0
+
+
+@pytest.mark.parametrize("pv", ["SIM:m1", "SIM:m1.RBV"])
+def test_the_filtered_names_are_parsed_back(pv: str) -> None:
+    assert parse_filtered_name(filtered_name(pv, 0.01)) == (pv, 0.01)
+    assert parse_filtered_name(filtered_name(pv, None)) == (pv, None)
+
+
+def test_the_metrics_are_kept_under_the_pv_name(sim) -> None:
+    metrics.reset()
+    channel, _ = channel_pool.monitor(
+        filtered_name("SIM:m1.RBV", 0.01), lambda **kwargs: None
+    )
+
+    assert wait_for(lambda: "monitor" in metrics.summary().get("SIM:m1.RBV", {}))
+    assert set(metrics.summary()) == {"SIM:m1.RBV"}
+    assert "connect" in metrics.summary()["SIM:m1.RBV"]
@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+from vresto.model import (
+    DiagnosticsModel,
+    DoubleValuePV,
+    ExecutorModel,
+    MetricsModel,
+    SchedulerModel,
+)
+
+from tests import wait_for
+
+
+def test_the_sample_has_the_worker_and_motion_queues(sim, application) -> None:
+    scheduler = SchedulerModel()
+    scheduler.add_job(print, delay=60.0)
+    scheduler.add_job(print, delay=60.0, interval=60.0)
+    executor = ExecutorModel(max_threads=1)
+    diagnostics = DiagnosticsModel(scheduler, executor, source=MetricsModel())
+
+    sim.add_motor("SIM:m1", velocity=1.0)
+    stage = DoubleValuePV(pv="SIM:m1", movable=True, limited=False, monitor=True)
+    assert wait_for(lambda: stage.connected)
+    motion = stage.move(1.0)
+
+    sample = diagnostics.sample()
+    assert (sample.scheduled, sample.motions, sample.sends) == (2, 1, 0)
+    assert (sample.queued, sample.active) == (0, 0)
+
+    assert motion.result(timeout=5.0) is True
+    assert diagnostics.sample().motions == 0
+    executor.shutdown(timeout=1.0)
@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import time
+from enum import Enum
+
+from vresto.model import EpicsModel, channel_pool
+
+from tests import wait_for
+
+
+class _Config(Enum):
+    PRESENT = "SIM:present"
+    FIRST_MISSING = "SIM:first"
+    SECOND_MISSING = "SIM:second"
+
+
+def test_every_pv_has_its_own_status(sim) -> None:
+    sim.auto_motors = False
+    sim.add_record("SIM:present", 1.0)
+    model = EpicsModel(timeout=0.2, config=_Config)
+
+    status = model.connect()
+
+    assert status == {
+        "PRESENT": True,
+        "FIRST_MISSING": False,
+        "SECOND_MISSING": False,
+    }
+    assert not model.connected
+    assert model.failed == {
+        "FIRST_MISSING": "SIM:first",
+        "SECOND_MISSING": "SIM:second",
+    }
+    model.disconnect()
+    assert channel_pool.channels == 0
+
+
+def test_the_missing_pvs_share_one_deadline(sim) -> None:
+    sim.auto_motors = False
+    model = EpicsModel(timeout=0.3, config=_Config)
+
+    started = time.monotonic()
+    model.connect()
+
+    # Waiting for each PV in turn would take the timeout three times
+    assert time.monotonic() - started < 0.6
+    model.disconnect()
+
+
+def test_connection_changes_are_passed_on(sim) -> None:
+    sim.auto_motors = False
+    sim.add_record("SIM:present", 1.0)
+    model = EpicsModel(timeout=1.0, config=_Config)
+    changes = []
+    model.add_connection_callback(lambda name, connected: changes.append(connected))
+    model.connect()
+    channel = model._channels["PRESENT"]
+    assert changes == [True]
+    changes.clear()
+
+    # Drop and restore the channel on the transport thread, as an IOC restart would
+    sim._schedule(time.monotonic(), channel._disconnected)
+    assert wait_for(lambda: changes == [False])
+    assert not model.status["PRESENT"]
+
+    sim._schedule(time.monotonic(), sim._connect, channel)
+    assert wait_for(lambda: changes == [False, True])
+    assert model.status["PRESENT"]
+    model.disconnect()
@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import threading
+
+from vresto.model import ExecutorModel, TaskPriority
+
+from tests import wait_for
+
+
+def test_shutdown_cancels_the_queued_tasks(application) -> None:
+    executor = ExecutorModel(max_threads=1)
+    started, release = threading.Event(), threading.Event()
+
+    def block() -> bool:
+        started.set()
+        return release.wait(5.0)
+
+    running = executor.submit(block)
+    queued = [executor.submit(lambda: None) for _ in range(3)]
+    cancelled = []
+    for task in queued:
+        task.cancelled.connect(lambda: cancelled.append(True))
+    assert started.wait(timeout=2.0)
+
+    # The running task finishes while shutdown waits for it
+    threading.Timer(0.1, release.set).start()
+    assert executor.shutdown(timeout=2.0)
+    application.processEvents()
+
+    assert running.done and running.result is True
+    assert all(task.wait(timeout=0) and task.is_cancelled for task in queued)
+    assert len(cancelled) == 3
+    assert executor.queued == 0
+
+
+def test_higher_priorities_run_first(application) -> None:
+    executor = ExecutorModel(max_threads=1)
+    release = threading.Event()
+    order = []
+
+    executor.submit(release.wait, 5.0)
+    tasks = [
+        executor.submit(order.append, priority, priority=priority)
+        for priority in (
+            TaskPriority.HOUSEKEEPING,
+            TaskPriority.MOTION,
+            TaskPriority.READBACK,
+        )
+    ]
+    release.set()
+
+    assert all(task.wait(timeout=2.0) for task in tasks)
+    assert order == [
+        TaskPriority.MOTION,
+        TaskPriority.READBACK,
+        TaskPriority.HOUSEKEEPING,
+    ]
+    executor.shutdown(timeout=1.0)
+
+
+def test_the_callbacks_receive_the_results_of_short_jobs(application) -> None:
+    executor = ExecutorModel(max_threads=2)
+    results, errors = [], []
+
+    def fail() -> None:
+        raise ValueError("No motor")
+
+    executor.submit(lambda: 42, on_finished=results.append)
+    executor.submit(fail, on_failed=errors.append)
+
+    # The signals are emitted after the tasks are done, and received on this thread
+    assert wait_for(lambda: application.processEvents() or (results and errors))
+    assert results == [42]
+    assert [str(error) for error in errors] == ["No motor"]
+    executor.shutdown(timeout=1.0)
@@ -0,0 +1,31 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import pytest
+
+from benchmarks.bench_import_time import _budget, _measure
+
+
+@pytest.mark.parametrize("module", ["vresto", "vresto.model"])
+def test_the_import_is_cheap_and_free_of_heavy_modules(module: str) -> None:
+    results = [_measure(module) for _ in range(3)]
+
+    assert min(result["time"] for result in results) <= _budget
+    assert all(result["modules"] == [] for result in results)
@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+from vresto.model import ReadbackMailboxModel
+
+from tests import wait_for
+
+
+def test_only_the_latest_value_is_delivered(application) -> None:
+    mailbox = ReadbackMailboxModel(rate=1.0)
+    received = []
+    key = mailbox.subscribe(received.append)
+
+    for value in (1.0, 2.0, 3.0):
+        mailbox.post(key, value)
+    mailbox.drain()
+
+    assert received == [3.0]
+    assert (mailbox.posted, mailbox.deliveries) == (3, 1)
+    mailbox.unsubscribe(key)
+
+
+def test_unchanged_values_are_not_delivered_again(application) -> None:
+    mailbox = ReadbackMailboxModel(rate=1.0)
+    received = []
+    key = mailbox.subscribe(received.append)
+
+    mailbox.post(key, 1.0)
+    mailbox.drain()
+    mailbox.post(key, 1.0)
+    mailbox.drain()
+
+    assert received == [1.0]
+    mailbox.unsubscribe(key)
+    mailbox.post(key, 2.0)
+    mailbox.drain()
+    assert received == [1.0]
+
+
+def test_the_values_are_drained_at_the_rate(application) -> None:
+    mailbox = ReadbackMailboxModel(rate=100.0)
+    received = []
+    key = mailbox.subscribe(received.append)
+
+    mailbox.post(key, 1.0)
+    mailbox.post(key, 2.0)
+
+    assert wait_for(lambda: application.processEvents() or received == [2.0])
+    mailbox.unsubscribe(key)
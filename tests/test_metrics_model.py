@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import random
+
+import pytest
+
+from vresto.model import LatencyHistogram, MetricsModel
+
+
+@pytest.mark.parametrize("percentile", [50, 90, 99, 99.9])
+def test_percentiles_are_within_the_precision(percentile) -> None:
+    generator = random.Random(4)
+    values = [int(generator.lognormvariate(6.0, 1.5)) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    exact = sorted(values)[max(1, round(len(values) * percentile / 100.0)) - 1]
+    estimate = histogram.percentile(percentile)
+
+    # The upper end of the bucket of the exact value, at most 2 / 32 above it
+    assert exact <= estimate <= exact * (1 + 2 / 32) + 1
+
+
+def test_small_values_are_exact() -> None:
+    histogram = LatencyHistogram()
+    for value in range(1, 11):
+        histogram.record(value)
+
+    summary = histogram.summary()
+    assert (summary["min_us"], summary["p50_us"], summary["max_us"]) == (1, 5, 10)
+    assert summary["count"] == 10
+    assert summary["mean_us"] == 5.5
+
+
+def test_merged_histograms_match_a_single_one() -> None:
+    single, first, second = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for value in range(0, 100000, 7):
+        single.record(value)
+        (first if value % 2 else second).record(value)
+    first.merge(second)
+
+    assert first.summary() == single.summary()
+
+
+def test_timer_counts_exceptions_as_errors() -> None:
+    metrics = MetricsModel()
+
+    with metrics.timer("SIM:m1", "put"):
+        pass
+    with pytest.raises(RuntimeError):
+        with metrics.timer("SIM:m1", "put"):
+            raise RuntimeError("put failed")
+
+    summary = metrics.summary("SIM:m1")["SIM:m1"]["put"]
+    assert summary["count"] == 2
+    assert summary["errors"] == 1
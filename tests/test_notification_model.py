@@ -0,0 +1,130 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import threading
+import time
+
+from vresto.model import Notification, NotificationModel
+
+
+def _listen(model: NotificationModel) -> list:
+    received = []
+    model.add_listener(received.append)
+    return received
+
+
+def test_repeats_are_shown_once_with_their_count() -> None:
+    model = NotificationModel(repeat_interval=0.05, rate_limit=100)
+    received = _listen(model)
+
+    assert model.post("Limit reached")
+    assert not model.post("Limit reached")
+    assert not model.post("Limit reached")
+    assert [notification.text for notification in received] == ["Limit reached"]
+
+    time.sleep(0.06)
+    assert model.post("Limit reached")
+    assert received[-1].repeated == 2
+    assert received[-1].text == "Limit reached (repeated 2 times)"
+
+
+def test_the_same_message_at_another_level_is_not_a_repeat() -> None:
+    model = NotificationModel(repeat_interval=10.0, rate_limit=100)
+    received = _listen(model)
+
+    assert model.post("Disconnected", level="error")
+    assert model.post("Disconnected", level="warning")
+    assert [notification.level for notification in received] == ["error", "warning"]
+
+
+def test_messages_over_the_rate_limit_are_queued_and_flushed() -> None:
+    model = NotificationModel(repeat_interval=10.0, rate_limit=2)
+    received = _listen(model)
+    flushed = threading.Event()
+    model.add_listener(lambda notification: len(received) == 4 and flushed.set())
+
+    results = [model.post(f"Message {number}") for number in range(4)]
+
+    assert results == [True, True, False, False]
+    assert model.queued == 2
+    assert flushed.wait(timeout=3.0)
+    assert [notification.message for notification in received] == [
+        f"Message {number}" for number in range(4)
+    ]
+    assert model.queued == 0
+    assert model.dropped == 0
+
+
+def test_repeats_of_queued_messages_are_counted() -> None:
+    model = NotificationModel(repeat_interval=10.0, rate_limit=1)
+    received = _listen(model)
+    flushed = threading.Event()
+    model.add_listener(lambda notification: len(received) == 2 and flushed.set())
+
+    model.post("First")
+    model.post("Second")
+    model.post("Second")
+
+    assert flushed.wait(timeout=3.0)
+    assert received[1] == Notification(message="Second", level="error")
+    assert received[1].repeated == 1
+
+
+def test_messages_are_dropped_when_the_queue_is_full() -> None:
+    model = NotificationModel(repeat_interval=10.0, rate_limit=1, max_queued=2)
+    _listen(model)
+
+    for number in range(5):
+        model.post(f"Message {number}")
+
+    assert model.queued == 2
+    assert model.dropped == 2
+
+
+def test_old_messages_are_pruned() -> None:
+    model = NotificationModel(repeat_interval=0.01, rate_limit=1000)
+
+    for number in range(100):
+        model.post(f"Position {number}")
+    time.sleep(0.02)
+    model.post("Position 100")
+
+    assert list(model._last_shown) == [("error", "Position 100")]
+
+
+def test_repeats_of_a_message_not_posted_again_are_passed_on() -> None:
+    model = NotificationModel(repeat_interval=0.05, rate_limit=100)
+    received = _listen(model)
+    flushed = threading.Event()
+    model.add_listener(lambda notification: len(received) == 3 and flushed.set())
+
+    model.post("Limit reached")
+    model.post("Limit reached")
+    model.post("Limit reached")
+    time.sleep(0.06)
+    model.post("Disconnected")
+
+    assert flushed.wait(timeout=3.0)
+    assert [notification.text for notification in received] == [
+        "Limit reached",
+        "Limit reached (repeated 2 times)",
+        "Disconnected",
+    ]
+    assert model._suppressed == {}
@@ -0,0 +1,154 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from vresto.model import (
+    DoubleValuePV,
+    MotionState,
+    PVCacheModel,
+    PVModel,
+    SchedulerModel,
+    subscription_profiles,
+)
+from vresto.model import channel_pool, pv_model
+
+from tests import wait_for
+
+
+def _stage(**kwargs) -> DoubleValuePV:
+    stage = DoubleValuePV(
+        pv="SIM:m1", movable=True, rbv_extension=True, monitor=True, **kwargs
+    )
+    assert wait_for(lambda: stage.connected)
+    return stage
+
+
+def test_the_latest_target_wins(sim) -> None:
+    sim.add_motor("SIM:m1", velocity=20.0, acceleration=0.01)
+    stage = _stage(limited=False)
+
+    first = stage.move(1.0)
+    replaced = stage.move(2.0)
+    latest = stage.move(3.0)
+
+    assert replaced.result(timeout=5.0) is False
+    assert first.result(timeout=5.0) is True
+    assert latest.result(timeout=5.0) is True
+    assert sim.value("SIM:m1.RBV") == 3.0
+    assert stage.state is MotionState.IDLE
+
+
+def test_a_motion_that_never_completes_times_out(sim) -> None:
+    sim.add_motor("SIM:m1", velocity=0.1, acceleration=0.01)
+    stage = _stage(limited=False, motion_timeout=0.1)
+
+    motion = stage.move(10.0)
+    pending = stage.move(5.0)
+
+    assert motion.result(timeout=2.0) is False
+    assert pending.result(timeout=2.0) is False
+    assert stage.state is MotionState.IDLE
+
+    # A later move is sent right away instead of being queued
+    sim._records["SIM:m1"].fields["VELO"] = 100.0
+    object.__setattr__(stage, "motion_timeout", 5.0)
+    assert stage.move(0.5).result(timeout=5.0) is True
+
+
+def test_a_move_on_a_disconnected_channel_fails_right_away(sim) -> None:
+    sim.auto_motors = False
+    sim.timeout = 0.5
+    stage = DoubleValuePV(pv="SIM:missing", movable=True, limited=False)
+
+    started = time.monotonic()
+    first = stage.move(1.0)
+    second = stage.move(2.0)
+
+    assert time.monotonic() - started < 0.25
+    assert first.result(timeout=0.0) is False
+    assert second.result(timeout=0.0) is False
+    assert stage.state is MotionState.IDLE
+
+
+def test_the_pending_target_is_dropped_after_shutdown(sim, monkeypatch) -> None:
+    monkeypatch.setattr(pv_model, "_dispatcher", ThreadPoolExecutor(max_workers=1))
+    monkeypatch.setattr(pv_model, "_watchdog", SchedulerModel())
+    monkeypatch.setattr(pv_model, "_watchdog_thread", None)
+    sim.add_motor("SIM:m1", velocity=20.0, acceleration=0.01)
+    stage = _stage(limited=False)
+
+    first = stage.move(1.0)
+    pending = stage.move(2.0)
+    pv_model.shutdown_motions()
+
+    assert first.result(timeout=5.0) is True
+    assert pending.result(timeout=5.0) is False
+    assert sim.value("SIM:m1.RBV") == 1.0
+    assert stage.state is MotionState.IDLE
+    assert pv_model._watchdog.stopped
+
+
+def test_cached_limits_are_not_enforced(sim, tmp_path, monkeypatch) -> None:
+    cache = PVCacheModel(path=str(tmp_path / "pv_cache.json"))
+    cache.save([{"pv": "SIM:m1", "readback": 0.0, "low_limit": 0.0, "high_limit": 1.0}])
+    cache.load()
+    monkeypatch.setattr(pv_model, "pv_cache", cache)
+
+    sim.add_motor("SIM:m1", velocity=100.0, low_limit=-10.0, high_limit=10.0)
+    # Only the limits arrive late, the channel of the moves is already connected
+    channel = channel_pool.acquire("SIM:m1")
+    assert wait_for(lambda: channel.connected)
+    sim.connect_delay = 0.2
+    stage = DoubleValuePV(
+        pv="SIM:m1", movable=True, limited=True, rbv_extension=True, monitor=True
+    )
+
+    assert stage.stale
+    assert (stage.low_limit, stage.high_limit) == (0.0, 1.0)
+    assert stage.move(5.0).result(timeout=5.0) is True
+
+    assert wait_for(lambda: stage.high_limit == 10.0)
+    assert stage.move(20.0).result(timeout=1.0) is False
+
+
+def test_the_deadband_is_sent_as_a_channel_filter(sim) -> None:
+    stage = _stage(limited=False, role="logging", deadband=0.01)
+    channel = stage._monitors[0][0]
+
+    assert channel.pvname == 'SIM:m1.RBV{"dbnd":{"abs":0.01}}'
+    assert channel.mask == subscription_profiles["logging"].mask
+
+
+def test_the_deadband_is_applied_on_the_client(sim, monkeypatch) -> None:
+    monkeypatch.setattr(PVModel, "channel_filters", False)
+    stage = _stage(limited=False, deadband=0.01)
+    readbacks = []
+    stage.add_readback_callback(readbacks.append)
+    assert stage._monitors[0][0].pvname == "SIM:m1.RBV"
+
+    # Publish on the transport thread, as the IOC would
+    motor = sim._records["SIM:m1"]
+    for value in (0.005, 0.009, 0.02):
+        sim._schedule(time.monotonic(), sim._publish, motor, "RBV", value)
+
+    assert wait_for(lambda: stage.readback == 0.02)
+    assert readbacks == [0.02]
@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import math
+
+import pytest
+from epics import dbr
+
+from vresto.model import (
+    DoubleValuePV,
+    RecordedEvent,
+    RecordingTransportModel,
+    ReplayTransportModel,
+    SimTransportModel,
+    channel_pool,
+    read_recording,
+)
+
+from tests import wait_for
+
+
+@pytest.fixture
+def recording(sim, tmp_path) -> str:
+    """Records a move of SIM:m1 on the simulated transport, returns the path."""
+    path = str(tmp_path / "traffic.bin")
+    sim.add_motor("SIM:m1", velocity=50.0, acceleration=0.01)
+    channel_pool.finalize(timeout=1.0)
+    channel_pool.transport = RecordingTransportModel(sim, path)
+
+    stage = DoubleValuePV(
+        pv="SIM:m1", movable=True, limited=True, rbv_extension=True, monitor=True
+    )
+    assert wait_for(lambda: stage.connected and stage.high_limit is not None)
+    stage.set_high_limit(50.0)
+    assert stage.move(2.0).result(timeout=5.0) is True
+    assert wait_for(lambda: stage.readback == 2.0)
+
+    del stage
+    channel_pool.finalize(timeout=1.0)
+    channel_pool.transport = SimTransportModel()
+    return path
+
+
+def test_the_recording_has_every_event(recording) -> None:
+    events = list(read_recording(recording))
+    kinds = {event for _, event, _, _ in events}
+    channels = {
+        values[0]: values
+        for _, event, _, values in events
+        if event is RecordedEvent.CHANNEL
+    }
+
+    assert kinds == set(RecordedEvent) - {RecordedEvent.GET}
+    assert channels["SIM:m1.HLM"][1:] == ["time", dbr.DBE_VALUE | dbr.DBE_ALARM]
+    assert [elapsed for elapsed, _, _, _ in events] == sorted(
+        elapsed for elapsed, _, _, _ in events
+    )
+
+    # Only the move asked for a completion, the limit write did not
+    puts = [event for _, event, _, _ in events if event is RecordedEvent.PUT]
+    completions = [
+        event for _, event, _, _ in events if event is RecordedEvent.PUT_COMPLETE
+    ]
+    assert (len(puts), len(completions)) == (2, 1)
+
+
+def test_the_replay_feeds_the_recorded_values_back(recording) -> None:
+    channel_pool.finalize(timeout=1.0)
+    replay = ReplayTransportModel(recording, speed=math.inf)
+    channel_pool.transport = replay
+
+    stage = DoubleValuePV(
+        pv="SIM:m1", movable=True, limited=True, rbv_extension=True, monitor=True
+    )
+
+    assert replay.wait(timeout=5.0)
+    assert wait_for(lambda: stage.connected)
+    assert stage.readback == 2.0
+    assert stage.high_limit == 50.0
+
+
+def test_the_replay_matches_the_event_mask(recording) -> None:
+    channel_pool.finalize(timeout=1.0)
+    replay = ReplayTransportModel(recording, speed=math.inf)
+    channel_pool.transport = replay
+
+    recorded = channel_pool.acquire("SIM:m1.HLM", mask=dbr.DBE_VALUE | dbr.DBE_ALARM)
+    other = channel_pool.acquire("SIM:m1.HLM", mask=dbr.DBE_LOG | dbr.DBE_ALARM)
+
+    assert replay.wait(timeout=5.0)
+    assert wait_for(lambda: recorded.connected)
+    assert not other.connected
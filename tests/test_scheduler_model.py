@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import heapq
+import threading
+
+from vresto.model import ScheduledJob, SchedulerModel
+
+
+def _run(scheduler: SchedulerModel) -> threading.Thread:
+    thread = threading.Thread(target=scheduler.run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_jobs_run_in_deadline_order() -> None:
+    scheduler = SchedulerModel()
+    order = []
+    done = threading.Event()
+
+    scheduler.add_job(order.append, args=("late",), delay=0.06)
+    scheduler.add_job(order.append, args=("early",), delay=0.02)
+    scheduler.add_job(order.append, args=("first",))
+    scheduler.add_job(done.set, delay=0.1)
+    thread = _run(scheduler)
+
+    assert done.wait(timeout=2.0)
+    scheduler.stop()
+    thread.join(timeout=1.0)
+    assert order == ["first", "early", "late"]
+
+
+def test_jobs_with_the_same_deadline_keep_their_order() -> None:
+    jobs = [
+        ScheduledJob(deadline=1.0, number=number, method=print)
+        for number in (3, 1, 4, 0, 2)
+    ]
+    heapq.heapify(jobs)
+
+    assert [heapq.heappop(jobs).number for _ in range(5)] == [0, 1, 2, 3, 4]
+
+
+def test_cancelled_jobs_do_not_run() -> None:
+    scheduler = SchedulerModel()
+    ran = []
+    done = threading.Event()
+
+    job = scheduler.add_job(ran.append, args=("cancelled",), delay=0.02)
+    scheduler.add_job(done.set, delay=0.05)
+    scheduler.cancel(job)
+    assert scheduler.pending == 1
+    thread = _run(scheduler)
+
+    assert done.wait(timeout=2.0)
+    scheduler.stop()
+    thread.join(timeout=1.0)
+    assert ran == []
+
+
+def test_periodic_jobs_run_until_cancelled() -> None:
+    scheduler = SchedulerModel()
+    ticks = []
+    enough = threading.Event()
+
+    def tick() -> None:
+        ticks.append(1)
+        if len(ticks) == 3:
+            enough.set()
+
+    job = scheduler.add_job(tick, interval=0.01)
+    thread = _run(scheduler)
+
+    assert enough.wait(timeout=2.0)
+    scheduler.cancel(job)
+    scheduler.stop()
+    thread.join(timeout=1.0)
+    assert not thread.is_alive()
+    assert scheduler.pending == 0
@@ -18,13 +18,53 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ----------------------------------------------------------------------
 
-from vresto.controller import MainController
-from vresto import _version
+import importlib
+import logging
 
-__version__ = _version.get_versions()['version']
 __static_version__ = "0.0.4"
 
-if __version__ == "0+unknown":
-    __version__ = __static_version__
 
-app = MainController()
+def create_app(profiler=None):
+    """Creates the application, Qt and pyepics are imported only at this point."""
+    from vresto.model.profiler_model import StartupProfilerModel
+
+    if profiler is None:
+        profiler = StartupProfilerModel()
+
+    with profiler.phase("import"):
+        from vresto.controller import MainController
+
+    return MainController(profiler=profiler)
+
+
+def main() -> None:
+    """Application entry point, creates and runs the application."""
+    from vresto.model.profiler_model import StartupProfilerModel
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+
+    profiler = StartupProfilerModel()
+    app = create_app(profiler=profiler)
+
+    with profiler.phase("version"):
+        version = __getattr__("__version__")
+
+    app.run(version=version)
+
+
+def __getattr__(name: str):
+    """Resolves the version and creates the application lazily, on first access."""
+    if name == "__version__":
+        _version = importlib.import_module("vresto._version")
+        value = _version.get_versions()["version"]
+        if value == "0+unknown":
+            value = __static_version__
+    elif name == "app":
+        value = create_app()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
@@ -18,39 +18,153 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ----------------------------------------------------------------------
 
+import logging
+import os
 import sys
 import time
 from qtpy.QtWidgets import QApplication
 from qtpy.QtCore import QObject, Signal
+from typing import Dict, Optional
 
 from vresto.widget import MainWidget
-from vresto.model import MainModel, QtWorkerModel
+from vresto.widget.custom import MsgBox
+from vresto.widget.custom.q_switch import QSwitch
+from vresto.model import (
+    DiagnosticsModel,
+    MainModel,
+    Notification,
+    PVModel,
+    QtWorkerModel,
+    ReadbackMailboxModel,
+    RecordingTransportModel,
+    ReplayTransportModel,
+    SchedulerModel,
+    SimTransportModel,
+    StartupProfilerModel,
+    TaskPriority,
+    channel_pool,
+    shutdown_motions,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class MainController(QObject):
     """Base controller, initializes sub-controllers, creates and run main app worker and checks for epics connection."""
 
     _epics_connection_changed: Signal = Signal(bool)
+    _epics_channel_changed: Signal = Signal(str, bool)
+    _notification_received: Signal = Signal(str, str)
+    _epics_ready: Signal = Signal()
+
+    _shutdown_timeout: float = 3.0
+    _cache_interval: float = 60.0
+    # Rate in Hz at which the readbacks are delivered to the widgets
+    _readback_rate: float = 30.0
+
+    # Phases timed after the window is displayed
+    _startup_phases: tuple = ("first paint", "epics ready")
+    # If set, the startup phases are written to this JSON file and the application exits
+    _startup_profile_variable: str = "VRESTO_STARTUP_PROFILE"
+    # If set to 0, the widgets are not animated (remote X or VNC displays)
+    _animations_variable: str = "VRESTO_ANIMATIONS"
+    # If set to 0, the deadbands are not sent to the IOCs as channel filters
+    _channel_filters_variable: str = "VRESTO_CHANNEL_FILTERS"
+    # If set to sim, the PVs are simulated in-process instead of using Channel Access
+    _transport_variable: str = "VRESTO_TRANSPORT"
+    # If set, the PV traffic is recorded to this file, or replayed from it
+    _record_variable: str = "VRESTO_RECORD"
+    _replay_variable: str = "VRESTO_REPLAY"
+    # Speed of the replay, inf to replay as fast as possible
+    _replay_speed_variable: str = "VRESTO_REPLAY_SPEED"
+    # If set, the PV metrics are written to this JSON file at exit
+    _metrics_variable: str = "VRESTO_METRICS"
+    # If set to 1, the diagnostics tab is shown after the alignment tab
+    _diagnostics_variable: str = "VRESTO_DIAGNOSTICS"
 
-    def __init__(self) -> None:
+    def __init__(self, profiler: Optional[StartupProfilerModel] = None) -> None:
         super(MainController, self).__init__()
 
-        self._app = QApplication(sys.argv)
-        self._model = MainModel()
-        self._widget = MainWidget(self._model.paths)
+        self._profiler = profiler if profiler is not None else StartupProfilerModel()
+
+        with self._profiler.phase("qapplication"):
+            self._app = QApplication(sys.argv)
+
+        if os.environ.get(self._animations_variable, "1") == "0":
+            QSwitch.set_animated(False)
+        if os.environ.get(self._channel_filters_variable, "1") == "0":
+            PVModel.channel_filters = False
+        self._select_transport()
+
+        with self._profiler.phase("widget"):
+            self._model = MainModel()
+            ReadbackMailboxModel.shared().rate = self._readback_rate
+            # One application-wide stylesheet, shared by the window and every dialog
+            self._app.setStyleSheet(self._model.paths.stylesheet("main.qss"))
+            self._widget = MainWidget(
+                self._model.paths,
+                diagnostics=os.environ.get(self._diagnostics_variable) == "1",
+            )
 
         # Event helpers
-        self._time_started = None
+        self._epics_initialized: bool = False
+        self._startup_reported: bool = False
+
+        # Report the startup time when the window is painted and epics is ready
+        self._widget.painted.connect(self._on_first_paint)
+        self._epics_ready.connect(self._report_startup)
 
-        # Connect epics connection signal
+        # Connect epics connection signals, the channel callbacks run from the CA thread
         self._epics_connection_changed.connect(self._update_epics_status_label)
+        self._epics_channel_changed.connect(self._update_epics_channel_status)
+        self._model.epics.add_connection_callback(self._on_epics_channel_changed)
+
+        # Notifications can be posted from any thread, they are shown on the GUI thread
+        self._notification_received.connect(self._widget.show_notification)
+        self._model.notifications.add_listener(self._on_notification)
+
+        # Background jobs run on the application thread worker
+        self._scheduler = SchedulerModel()
+        self._scheduler.add_job(
+            self._save_cache, delay=self._cache_interval, interval=self._cache_interval
+        )
+
+        # The diagnostics are sampled only when the diagnostics tab asks for them
+        self._diagnostics = None
+        if self._widget.diagnostics_widget is not None:
+            self._diagnostics = DiagnosticsModel(self._scheduler, self._model.executor)
+            self._widget.diagnostics_widget.shown.connect(self._diagnostics.reset)
+            self._widget.diagnostics_widget.refresh.connect(self._refresh_diagnostics)
+        self._widget.closing.connect(self._shutdown)
 
         # Application thread worker
         self._main_worker = QtWorkerModel(self._worker_methods, ())
         self._main_worker.start()
 
+        # The first epics connection runs on the executor
+        self._profiler.start("epics ready")
+        self._check_epics_connection()
+
+    def _select_transport(self) -> None:
+        """Sets the transport of the channel pool from the environment, Channel Access by default."""
+        replay = os.environ.get(self._replay_variable)
+        if replay:
+            speed = float(os.environ.get(self._replay_speed_variable, "1.0"))
+            channel_pool.transport = ReplayTransportModel(replay, speed=speed)
+            return None
+
+        if os.environ.get(self._transport_variable) == SimTransportModel.name:
+            channel_pool.transport = SimTransportModel()
+
+        record = os.environ.get(self._record_variable)
+        if record:
+            channel_pool.transport = RecordingTransportModel(
+                channel_pool.transport, record
+            )
+
     def run(self, version: str) -> None:
         """Starts the application."""
+        self._profiler.start("first paint")
         self._widget.display(version=version)
         sys.exit(self._app.exec())
 
@@ -58,30 +172,177 @@ class MainController(QObject):
         """Updates the circle status label based on epics connection."""
         self._widget.lbl_epics_status.setEnabled(status)
 
+        failed = self._model.epics.failed
+        if failed:
+            self._widget.lbl_epics_status.setToolTip(
+                "Disconnected: " + ", ".join(sorted(failed.values()))
+            )
+        else:
+            self._widget.lbl_epics_status.setToolTip("")
+
+    def _update_epics_channel_status(self, name: str, connected: bool) -> None:
+        """Reports a change in the connection of a single PV on the status bar."""
+        state = "connected" if connected else "disconnected"
+        self._widget.statusBar().showMessage(f"{name} {state}", 10000)
+
+    def _on_epics_channel_changed(self, name: str, connected: bool) -> None:
+        """Emits the connection signals, called from the CA thread on every connection change."""
+        if not self._epics_initialized:
+            return None
+        self._epics_channel_changed.emit(name, connected)
+        self._epics_connection_changed.emit(self._model.epics.connected)
+
+    def _on_notification(self, notification: Notification) -> None:
+        """Passes a notification on to the GUI thread, called from the posting thread."""
+        self._notification_received.emit(notification.text, notification.level)
+
+    def _refresh_diagnostics(self) -> None:
+        """Shows a new sample of the diagnostics on the diagnostics tab."""
+        self._widget.diagnostics_widget.display(self._diagnostics.sample())
+
     def _check_epics_connection(self) -> None:
-        """Checks the epics connection every 5 minutes."""
-        # Initialize first connection if needed
-        if self._time_started is None:
-            self._time_started = time.time()
-            self._model.epics.connect()
-            self._epics_connection_changed.emit(self._model.epics.connected)
+        """Runs the first epics connection on the executor, changes after that are reported by the connection callbacks."""
+        self._model.executor.submit(
+            self._model.epics.connect,
+            priority=TaskPriority.READBACK,
+            on_finished=self._on_epics_connected,
+            on_failed=self._on_epics_connection_failed,
+        )
+
+    def _on_epics_connected(self, status: Dict[str, bool]) -> None:
+        """Reports the first epics connection, called on the GUI thread."""
+        self._epics_initialized = True
+        self._profiler.stop("epics ready")
+
+        # Emit connection changed signal
+        self._epics_connection_changed.emit(self._model.epics.connected)
+        self._epics_ready.emit()
+
+    def _on_epics_connection_failed(self, error: BaseException) -> None:
+        """Reports an error raised by the first epics connection, called on the GUI thread."""
+        logger.error("The epics connection failed", exc_info=error)
+        self._model.notifications.post(f"The epics connection failed: {error}")
+        self._on_epics_connected(self._model.epics.status)
 
-        now = time.time()
-        # If time difference is more than 5 minutes try epics connect again
-        if now - self._time_started > 300:
-            self._time_started = time.time()
+    def _on_first_paint(self) -> None:
+        self._profiler.stop("first paint")
+        self._report_startup()
 
-            self._model.epics.connect()
+        # Create the shared message box now, so the first error is cheap to show
+        MsgBox.shared(self._widget)
 
-            # Emit connection changed signal
-            self._epics_connection_changed.emit(self._model.epics.connected)
+    def _report_startup(self) -> None:
+        """Reports the startup phases on the status bar and the log, once all of them are timed."""
+        if self._startup_reported:
+            return None
+
+        if not self._profiler.finished(*self._startup_phases):
+            return None
+        self._startup_reported = True
+
+        summary = self._profiler.summary()
+        logger.info(summary)
+        self._widget.statusBar().showMessage(summary, 10000)
+
+        path = os.environ.get(self._startup_profile_variable)
+        if path:
+            self._profiler.dump(path)
+            self._shutdown()
+            self._app.quit()
 
     def _worker_methods(self) -> None:
         """Runs all the worker methods."""
+        self._scheduler.run()
+
+    def _shutdown(self) -> None:
+        """
+        Shuts down the application in order: stops the workers, the executor and
+        the PV motion threads, saves the PV cache and the metrics, clears the
+        monitors and disconnects the CA channels. Every step is bound by the
+        shutdown timeout, and the steps that did not complete are reported.
+        """
+        started = time.perf_counter()
+        blocked = []
+
+        steps = (
+            ("main worker", self._stop_main_worker),
+            ("executor", self._stop_executor),
+            ("motions", self._stop_motions),
+            ("cache", self._save_cache),
+            ("metrics", self._dump_metrics),
+            ("monitors", self._clear_monitors),
+            ("channels", self._disconnect_channels),
+        )
+        for name, step in steps:
+            step_started = time.perf_counter()
+            try:
+                completed = step()
+            except Exception:
+                logger.exception("Shutdown step '%s' failed", name)
+                completed = False
+
+            logger.info(
+                "Shutdown step '%s' took %.3f s",
+                name,
+                time.perf_counter() - step_started,
+            )
+            if not completed:
+                blocked.append(name)
+
+        if blocked:
+            logger.warning("Shutdown was blocked by: %s", ", ".join(blocked))
+        logger.info("Shutdown finished in %.3f s", time.perf_counter() - started)
+
+    def _stop_main_worker(self) -> bool:
+        """
+        Stops the scheduler and waits for the main worker. A worker blocked in a job
+        is not killed, it is reported and left to end with the process.
+        """
+        self._scheduler.stop()
+        return self._main_worker.wait(int(self._shutdown_timeout * 1000))
+
+    def _stop_executor(self) -> bool:
+        """Drops the queued executor jobs and waits for the running ones."""
+        return self._model.executor.shutdown(timeout=self._shutdown_timeout)
+
+    @staticmethod
+    def _stop_motions() -> bool:
+        """Drops the move targets not sent yet and stops the motion timeouts."""
+        shutdown_motions()
+        return True
+
+    def _save_cache(self) -> bool:
+        """Writes the last known values of the PVs to the warm-start cache."""
+        try:
+            self._model.cache.save(PVModel.snapshot_all())
+        except OSError:
+            logger.exception(
+                "Could not write the PV cache to %s", self._model.cache.path
+            )
+            return False
+        return True
+
+    def _dump_metrics(self) -> bool:
+        """Writes the PV metrics to the file of the metrics environment variable, if set."""
+        path = os.environ.get(self._metrics_variable)
+        if not path:
+            return True
+        try:
+            self._model.metrics.dump(path)
+        except OSError:
+            logger.exception("Could not write the PV metrics to %s", path)
+            return False
+        return True
 
-        while not self._widget.terminated:
-            self._check_epics_connection()
-            time.sleep(0.05)
+    @staticmethod
+    def _clear_monitors() -> bool:
+        """Clears the monitors of all the PVs."""
+        PVModel.clear_all_monitors()
+        return True
 
-        # Set as finished so UI can exit
-        self._widget.worker_finished = True
+    def _disconnect_channels(self) -> bool:
+        """Releases the channels of the pool and stops the transport."""
+        started = time.perf_counter()
+        self._model.epics.disconnect()
+        self._model.channels.finalize(timeout=self._shutdown_timeout)
+        return time.perf_counter() - started < self._shutdown_timeout
@@ -18,10 +18,64 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ----------------------------------------------------------------------
 
-from vresto.model.corrections_model import CorrectionsModel
-from vresto.model.epics_model import EpicsModel
-from vresto.model.path_model import PathModel
-from vresto.model.pv_model import PVModel, DoubleValuePV, StringValuePV
-from vresto.model.event_filter_model import EventFilterModel
-from vresto.model.qt_worker_model import QtWorkerModel
-from vresto.model.main_model import MainModel
+import importlib
+
+# The models are imported lazily, so importing vresto.model does not import Qt or pyepics
+_exports = {
+    "CorrectionsModel": "vresto.model.corrections_model",
+    "NotificationModel": "vresto.model.notification_model",
+    "Notification": "vresto.model.notification_model",
+    "notifications": "vresto.model.notification_model",
+    "PVCacheModel": "vresto.model.cache_model",
+    "pv_cache": "vresto.model.cache_model",
+    "ChannelPoolModel": "vresto.model.channel_model",
+    "channel_pool": "vresto.model.channel_model",
+    "TransportModel": "vresto.model.transport_model",
+    "CATransportModel": "vresto.model.transport_model",
+    "SimTransportModel": "vresto.model.sim_model",
+    "RecordingTransportModel": "vresto.model.recorder_model",
+    "ReplayTransportModel": "vresto.model.recorder_model",
+    "RecordedEvent": "vresto.model.recorder_model",
+    "read_recording": "vresto.model.recorder_model",
+    "EpicsModel": "vresto.model.epics_model",
+    "PathModel": "vresto.model.path_model",
+    "PVModel": "vresto.model.pv_model",
+    "DoubleValuePV": "vresto.model.pv_model",
+    "StringValuePV": "vresto.model.pv_model",
+    "MotionState": "vresto.model.pv_model",
+    "SubscriptionProfile": "vresto.model.pv_model",
+    "subscription_profiles": "vresto.model.pv_model",
+    "shutdown_motions": "vresto.model.pv_model",
+    "motion_backlog": "vresto.model.pv_model",
+    "ReadbackMailboxModel": "vresto.model.mailbox_model",
+    "EventFilterModel": "vresto.model.event_filter_model",
+    "QtWorkerModel": "vresto.model.qt_worker_model",
+    "ExecutorModel": "vresto.model.executor_model",
+    "TaskModel": "vresto.model.executor_model",
+    "TaskPriority": "vresto.model.executor_model",
+    "SchedulerModel": "vresto.model.scheduler_model",
+    "ScheduledJob": "vresto.model.scheduler_model",
+    "MetricsModel": "vresto.model.metrics_model",
+    "LatencyHistogram": "vresto.model.metrics_model",
+    "metrics": "vresto.model.metrics_model",
+    "DiagnosticsModel": "vresto.model.diagnostics_model",
+    "Diagnostics": "vresto.model.diagnostics_model",
+    "PVDiagnostics": "vresto.model.diagnostics_model",
+    "StartupProfilerModel": "vresto.model.profiler_model",
+    "MainModel": "vresto.model.main_model",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name: str):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_exports[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+
+def _default_path() -> str:
+    """Returns the path of the cache file in the user cache directory."""
+    if os.name == "nt":
+        directory = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    else:
+        directory = os.environ.get(
+            "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+        )
+    return os.path.join(directory, "vresto", "pv_cache.json")
+
+
+class PVCacheModel:
+    """
+    Warm-start cache of the last known PV values.
+
+    The readbacks, limits and timestamps of the PVs are written to a small JSON file
+    on shutdown and periodically. At startup the PVs are pre-populated from it and
+    marked as stale until live data arrives. The file can also be inspected offline.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self._path = path if path is not None else _default_path()
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    def load(self) -> int:
+        """Loads the cache file, returns the number of PVs loaded. A missing or broken file is ignored."""
+        try:
+            with open(self._path, "r") as file:
+                entries = json.load(file)["pvs"]
+        except (OSError, ValueError, KeyError, TypeError):
+            entries = {}
+
+        with self._lock:
+            self._entries = dict(entries)
+            return len(self._entries)
+
+    def save(self, snapshots: Iterable[Dict[str, Any]]) -> None:
+        """Updates the cache with the given PV snapshots and writes it to the file."""
+        with self._lock:
+            for snapshot in snapshots:
+                self._entries[snapshot["pv"]] = snapshot
+            content = {"saved": time.time(), "pvs": self._entries}
+
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            temporary = self._path + ".tmp"
+            with open(temporary, "w") as file:
+                json.dump(content, file, indent=1)
+            os.replace(temporary, self._path)
+
+    def get(self, pv: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached values of a PV, if any."""
+        with self._lock:
+            return self._entries.get(pv)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+
+# Process-wide cache, the PVs are pre-populated from it when created
+pv_cache = PVCacheModel()
@@ -0,0 +1,289 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import inspect
+import json
+import logging
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from epics import dbr
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from vresto.model.metrics_model import metrics
+from vresto.model.transport_model import CATransportModel, TransportModel
+
+logger = logging.getLogger(__name__)
+
+# Channel name, form and event mask
+ChannelKey = Tuple[str, str, int]
+
+# The event mask of the channels created without one, the same as pyepics
+_default_mask = dbr.DBE_VALUE | dbr.DBE_ALARM
+
+
+def _reference(callback: Callable) -> Callable[[], Optional[Callable]]:
+    """
+    Returns a reference to the callback, weak for bound methods so the pool does not
+    keep models alive. Slotted objects without __weakref__ cannot be referenced weakly,
+    they are kept alive until the callback is removed.
+    """
+    if inspect.ismethod(callback):
+        try:
+            return weakref.WeakMethod(callback)
+        except TypeError:
+            logger.debug(
+                "%s cannot be weakly referenced, %s is kept alive until it is removed",
+                type(callback.__self__).__name__,
+                callback.__qualname__,
+            )
+    return lambda: callback
+
+
+def filtered_name(pv: str, deadband: Optional[float]) -> str:
+    """Returns the channel name of the PV with the dbnd filter for the deadband, if any."""
+    if deadband is None:
+        return pv
+
+    filters = json.dumps({"dbnd": {"abs": deadband}}, separators=(",", ":"))
+    # Without a field name the filter is separated from the record name by a dot
+    return pv + filters if "." in pv else f"{pv}.{filters}"
+
+
+def parse_filtered_name(name: str) -> Tuple[str, Optional[float]]:
+    """Splits a channel name into the PV name and the deadband of its dbnd filter, if any."""
+    if "{" not in name:
+        return name, None
+
+    pv, filters = name.split("{", 1)
+    deadband = json.loads("{" + filters).get("dbnd", {})
+    return pv.rstrip("."), deadband.get("abs", deadband.get("d"))
+
+
+def _monitor_callback(callback: Callable, pv: str) -> Callable:
+    """
+    Wraps a monitor callback so that the channel does not keep its object alive, and
+    records its duration under the PV name, a callback that raises is counted as an
+    error.
+    """
+    reference = _reference(callback)
+
+    def call(**kwargs) -> None:
+        method = reference()
+        if method is not None:
+            with metrics.timer(pv, "monitor"):
+                method(**kwargs)
+
+    return call
+
+
+@dataclass(frozen=False, slots=True)
+class _PooledChannel:
+    """A channel of the pool with its reference count and connection callbacks."""
+
+    channel: Any
+    references: int = 0
+    created: float = field(default_factory=time.perf_counter)
+    connected: bool = False
+    connection_callbacks: List[Callable[[], Optional[Callable]]] = field(
+        default_factory=list
+    )
+
+
+class ChannelPoolModel:
+    """
+    Reference counted pool of channels, shared by all the models.
+
+    Every channel name, form and event mask has exactly one channel and one CA
+    subscription, however many monitors are added to it. The channels are created
+    without waiting for the connection, and disconnected when the last reference
+    is released. The connection callbacks are called as callback(pvname=..., conn=...),
+    from the CA thread. Bound methods are referenced weakly, so monitors do not keep
+    their models alive, except for slotted models that do not support weak references.
+
+    The channels are created by the transport, Channel Access by default. The
+    transport can only be changed while the pool is empty.
+    """
+
+    def __init__(self, transport: Optional[TransportModel] = None) -> None:
+        self._transport = transport if transport is not None else CATransportModel()
+        self._lock = threading.RLock()
+        self._channels: Dict[ChannelKey, _PooledChannel] = {}
+        self._keys: Dict[int, ChannelKey] = {}
+
+    @staticmethod
+    def _key(name: str, form: str, mask: Optional[int]) -> ChannelKey:
+        return name, form, mask if mask is not None else _default_mask
+
+    def acquire(self, name: str, form: str = "time", mask: Optional[int] = None) -> Any:
+        """Returns the channel for the name, creating it on the first reference."""
+        key = self._key(name, form, mask)
+        with self._lock:
+            pooled = self._channels.get(key)
+            if pooled is None:
+                pooled = _PooledChannel(
+                    channel=self._transport.create_channel(name, form, key[2])
+                )
+                pooled.channel.connection_callbacks.append(self._on_connection_changed)
+                self._channels[key] = pooled
+                self._keys[id(pooled.channel)] = key
+            pooled.references += 1
+            return pooled.channel
+
+    def release(self, channel: Any) -> None:
+        """Releases a reference to the channel, disconnecting it with the last one."""
+        with self._lock:
+            key = self._find(channel)
+            if key is None:
+                return None
+
+            pooled = self._channels[key]
+            pooled.references -= 1
+            if pooled.references > 0:
+                return None
+            del self._channels[key]
+            del self._keys[id(channel)]
+
+        channel.disconnect()
+
+    def monitor(
+        self,
+        name: str,
+        callback: Callable,
+        form: str = "time",
+        mask: Optional[int] = None,
+    ) -> Tuple[Any, int]:
+        """
+        Adds a monitor callback to the channel, acquiring it. The callback receives the
+        current value if the channel is already connected. Returns the channel and the
+        index of the callback, to be passed to unmonitor.
+        """
+        channel = self.acquire(name, form=form, mask=mask)
+        index = channel.add_callback(
+            _monitor_callback(callback, parse_filtered_name(name)[0]),
+            with_ctrlvars=False,
+        )
+        if channel.connected and channel.value is not None:
+            channel.run_callback(index)
+        return channel, index
+
+    def unmonitor(self, channel: Any, index: int) -> None:
+        """Removes a monitor callback added with monitor, releasing the channel."""
+        channel.remove_callback(index)
+        self.release(channel)
+
+    def add_connection_callback(self, channel: Any, callback: Callable) -> None:
+        """Registers a callback for the connection changes of an acquired channel."""
+        with self._lock:
+            key = self._find(channel)
+            if key is not None:
+                callbacks = self._channels[key].connection_callbacks
+                if all(reference() != callback for reference in callbacks):
+                    callbacks.append(_reference(callback))
+
+    def remove_connection_callback(self, channel: Any, callback: Callable) -> None:
+        """Removes a callback registered with add_connection_callback."""
+        with self._lock:
+            key = self._find(channel)
+            if key is not None:
+                callbacks = self._channels[key].connection_callbacks
+                callbacks[:] = [
+                    reference
+                    for reference in callbacks
+                    if reference() is not None and reference() != callback
+                ]
+
+    def _find(self, channel: Any) -> Optional[ChannelKey]:
+        """Returns the key of a channel of the pool, None if it is not in the pool."""
+        return self._keys.get(id(channel))
+
+    def _on_connection_changed(
+        self, pvname: str, conn: bool, pv: Any, **kwargs
+    ) -> None:
+        with self._lock:
+            key = self._find(pv)
+            if key is None:
+                return None
+            pooled = self._channels[key]
+            callbacks = list(pooled.connection_callbacks)
+            first = conn and not pooled.connected
+            pooled.connected |= conn
+
+        if first:
+            metrics.record(
+                parse_filtered_name(key[0])[0],
+                "connect",
+                time.perf_counter() - pooled.created,
+            )
+
+        for reference in callbacks:
+            callback = reference()
+            if callback is None:
+                continue
+            try:
+                callback(pvname=pvname, conn=conn)
+            except Exception:
+                logger.exception("Connection callback of %s failed", pvname)
+
+    def clear(self) -> None:
+        """Disconnects all the channels, regardless of their references."""
+        with self._lock:
+            channels = [pooled.channel for pooled in self._channels.values()]
+            self._channels.clear()
+            self._keys.clear()
+
+        for channel in channels:
+            channel.disconnect()
+
+    def finalize(self, timeout: float) -> None:
+        """Disconnects all the channels and stops the transport."""
+        self.clear()
+        self._transport.finalize(timeout)
+
+    @property
+    def transport(self) -> TransportModel:
+        return self._transport
+
+    @transport.setter
+    def transport(self, transport: TransportModel) -> None:
+        with self._lock:
+            if self._channels:
+                raise RuntimeError(
+                    "The transport cannot be changed while channels are in use"
+                )
+            self._transport = transport
+
+    @property
+    def channels(self) -> int:
+        """The number of channels in the pool."""
+        return len(self._channels)
+
+    @property
+    def references(self) -> Dict[str, int]:
+        """The references of every channel name."""
+        with self._lock:
+            references = {}
+            for (name, _, _), pooled in self._channels.items():
+                references[name] = references.get(name, 0) + pooled.references
+            return references
+
+
+channel_pool = ChannelPoolModel()
@@ -18,6 +18,10 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ----------------------------------------------------------------------
 
+import numpy as np
+import numpy.typing as npt
+from typing import Optional
+
 
 class CorrectionsModel:
     """Base correction model. It provides methods to get diamond thickness, position and real position."""
@@ -26,6 +30,11 @@ class CorrectionsModel:
     _fused_silica_index: float = 1.459
     _moissanite_index: float = 2.67
     _refraction_index: float = _diamond_index
+    _refraction_indices: dict = {
+        "diamond": _diamond_index,
+        "fused silica": _fused_silica_index,
+        "moissanite": _moissanite_index,
+    }
 
     _abort_status: bool = False
 
@@ -47,6 +56,50 @@ class CorrectionsModel:
         """Calculates and returns the real position."""
         return round(diamond_position - diamond_thickness, 4)
 
+    def get_diamond_thickness_array(
+        self,
+        virtual_positions: npt.ArrayLike,
+        diamond_positions: npt.ArrayLike,
+        material: Optional[str] = None,
+    ) -> np.ndarray:
+        """Calculates and returns the diamond thickness for arrays of positions."""
+        refraction_index = self._get_refraction_index(material=material)
+        virtual_positions = np.asarray(virtual_positions, dtype=np.float64)
+        diamond_positions = np.asarray(diamond_positions, dtype=np.float64)
+        return np.round((diamond_positions - virtual_positions) * refraction_index, 4)
+
+    def get_diamond_position_array(
+        self,
+        virtual_positions: npt.ArrayLike,
+        diamond_thicknesses: npt.ArrayLike,
+        material: Optional[str] = None,
+    ) -> np.ndarray:
+        """Calculates and returns the diamond position for arrays of positions and thicknesses."""
+        refraction_index = self._get_refraction_index(material=material)
+        virtual_positions = np.asarray(virtual_positions, dtype=np.float64)
+        diamond_thicknesses = np.asarray(diamond_thicknesses, dtype=np.float64)
+        return np.round(virtual_positions + diamond_thicknesses / refraction_index, 4)
+
+    @staticmethod
+    def get_real_position_array(
+        diamond_thicknesses: npt.ArrayLike, diamond_positions: npt.ArrayLike
+    ) -> np.ndarray:
+        """Calculates and returns the real position for arrays of thicknesses and positions."""
+        diamond_thicknesses = np.asarray(diamond_thicknesses, dtype=np.float64)
+        diamond_positions = np.asarray(diamond_positions, dtype=np.float64)
+        return np.round(diamond_positions - diamond_thicknesses, 4)
+
+    def _get_refraction_index(self, material: Optional[str] = None) -> float:
+        """Returns the refraction index of the given material, or the current one if no material is given."""
+        if material is None:
+            return self._refraction_index
+        return self._refraction_indices[material.lower()]
+
+    @classmethod
+    def materials(cls) -> list:
+        """Returns the names of all the supported materials."""
+        return list(cls._refraction_indices.keys())
+
     @property
     def refraction_index(self) -> float:
         return self._refraction_index
@@ -58,12 +111,8 @@ class CorrectionsModel:
     @refraction_index.setter
     def refraction_index(self, value: str) -> None:
         value = value.lower()
-        if value == "diamond":
-            self._refraction_index = self._diamond_index
-        elif value == "fused silica":
-            self._refraction_index = self._fused_silica_index
-        elif value == "moissanite":
-            self._refraction_index = self._moissanite_index
+        if value in self._refraction_indices:
+            self._refraction_index = self._refraction_indices[value]
 
     @abort_status.setter
     def abort_status(self, value: bool) -> None:
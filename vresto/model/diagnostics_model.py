@@ -0,0 +1,142 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from vresto.model.executor_model import ExecutorModel
+from vresto.model.metrics_model import MetricsModel, metrics
+from vresto.model.pv_model import motion_backlog
+from vresto.model.scheduler_model import SchedulerModel
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+@dataclass(frozen=True)
+class PVDiagnostics:
+    """The diagnostics of a PV, the latencies are in microseconds."""
+
+    pv: str = field(compare=True, repr=True)
+    event_rate: float = field(compare=False, repr=True, default=0.0)
+    monitor_p99: int = field(compare=False, repr=False, default=0)
+    connect: int = field(compare=False, repr=False, default=0)
+    put_p99: int = field(compare=False, repr=False, default=0)
+    motion_p50: int = field(compare=False, repr=False, default=0)
+    errors: int = field(compare=False, repr=False, default=0)
+
+
+@dataclass(frozen=True)
+class Diagnostics:
+    """A sample of the diagnostics of the PVs and of the process."""
+
+    pvs: List[PVDiagnostics] = field(compare=False, repr=False)
+    scheduled: int = field(compare=False, repr=True, default=0)
+    sends: int = field(compare=False, repr=True, default=0)
+    motions: int = field(compare=False, repr=True, default=0)
+    queued: int = field(compare=False, repr=True, default=0)
+    active: int = field(compare=False, repr=True, default=0)
+    memory: Optional[float] = field(compare=False, repr=True, default=None)
+
+
+def _memory() -> Optional[float]:
+    """Returns the resident memory of the process in MB, the peak if the current one is unknown."""
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        pass
+
+    if resource is None:
+        return None
+    # Kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if os.uname().sysname == "Darwin" else peak / 2**10
+
+
+class DiagnosticsModel:
+    """
+    Samples the diagnostics shown on the diagnostics tab: the latencies and monitor
+    event rates of every PV from the metrics, the queues of the main worker, of the
+    PV motions and of the executor, and the memory of the process. The event rates
+    are computed since the previous sample, reset starts over so the first sample
+    after it has no rates.
+    """
+
+    def __init__(
+        self,
+        scheduler: SchedulerModel,
+        executor: ExecutorModel,
+        source: Optional[MetricsModel] = None,
+    ) -> None:
+        self._scheduler = scheduler
+        self._executor = executor
+        self._metrics = source if source is not None else metrics
+        self._events: Dict[str, int] = {}
+        self._sampled: Optional[float] = None
+
+    def reset(self) -> None:
+        """Forgets the previous sample, so the rates start over, e.g. when the tab is shown."""
+        self._events = {}
+        self._sampled = None
+
+    def sample(self) -> Diagnostics:
+        """Returns the current diagnostics, the PVs with the highest event rates first."""
+        now = time.monotonic()
+        elapsed = now - self._sampled if self._sampled is not None else None
+        self._sampled = now
+
+        pvs = []
+        events = {}
+        for pv, operations in self._metrics.summary().items():
+            monitor = operations.get("monitor", {})
+            events[pv] = monitor.get("count", 0)
+            rate = 0.0
+            if elapsed:
+                rate = (events[pv] - self._events.get(pv, events[pv])) / elapsed
+
+            pvs.append(
+                PVDiagnostics(
+                    pv=pv,
+                    event_rate=rate,
+                    monitor_p99=monitor.get("p99_us", 0),
+                    connect=operations.get("connect", {}).get("max_us", 0),
+                    put_p99=operations.get("put", {}).get("p99_us", 0),
+                    motion_p50=operations.get("motion", {}).get("p50_us", 0),
+                    errors=sum(entry["errors"] for entry in operations.values()),
+                )
+            )
+        self._events = events
+
+        pvs.sort(key=lambda diagnostics: diagnostics.event_rate, reverse=True)
+        sends, motions = motion_backlog()
+        return Diagnostics(
+            pvs=pvs,
+            scheduled=self._scheduler.pending,
+            sends=sends,
+            motions=motions,
+            queued=self._executor.queued,
+            active=self._executor.active,
+            memory=_memory(),
+        )
@@ -18,11 +18,14 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ----------------------------------------------------------------------
 
+import threading
+import time
 from dataclasses import dataclass, field
 from enum import Enum
-from epics import pv
+from epics.pv import PV
+from typing import Callable, Dict, List, Type
 
-from vresto.widget.custom import MsgBox
+from vresto.model.channel_model import channel_pool
 
 
 class EpicsConnectionError(Exception):
@@ -34,7 +37,6 @@ class EpicsConnectionError(Exception):
 
     @property
     def message(self) -> str:
-        MsgBox(msg=self._message)
         return f"[EpicsConnectionError] - {self._message}"
 
 
@@ -46,31 +48,120 @@ class EpicsConfig(Enum):
 
 @dataclass(frozen=False, slots=True)
 class EpicsModel:
-    """Base epics model, used for testing the connection with all PVs given."""
+    """
+    Base epics model, used for testing the connection with all PVs given.
 
-    _connected: bool = field(init=False, compare=False, repr=False, default=False)
-
-    def connect(self) -> None:
-        """Check and set the connection status of all PVs included in the EpicsConfig."""
-        if not len(EpicsConfig):
-            return None
-
-        for name, member in EpicsConfig.__members__.items():
+    After the first connect, the connection status of every PV is tracked through
+    the pyepics connection callbacks, and every change is passed on to the callbacks
+    registered with add_connection_callback as (name, connected). The channels are
+    acquired from the shared channel pool, and kept until disconnect is called.
+    The PVs are the members of config, EpicsConfig by default.
+    """
 
-            if not len(member.value) > 2:
-                value = member.value[0]
-            else:
-                value = member.value
+    timeout: float = field(init=True, compare=False, repr=True, default=5.0)
+    config: Type[Enum] = field(init=True, compare=False, repr=True, default=EpicsConfig)
 
-            try:
-                pv_check = pv.get_pv(value, connect=True)
-                if not pv_check.connected:
-                    raise EpicsConnectionError(f"Could not connect {name} ({value})")
-            except EpicsConnectionError:
+    _connected: bool = field(init=False, compare=False, repr=False, default=False)
+    _status: Dict[str, bool] = field(
+        init=False, compare=False, repr=False, default_factory=dict
+    )
+    _names: Dict[str, str] = field(
+        init=False, compare=False, repr=False, default_factory=dict
+    )
+    _callbacks: List[Callable[[str, bool], None]] = field(
+        init=False, compare=False, repr=False, default_factory=list
+    )
+    _channels: Dict[str, PV] = field(
+        init=False, compare=False, repr=False, default_factory=dict
+    )
+    _lock: threading.Lock = field(
+        init=False, compare=False, repr=False, default_factory=threading.Lock
+    )
+
+    def connect(self) -> Dict[str, bool]:
+        """
+        Check and set the connection status of all PVs included in the config.
+
+        All the channels are created up front without waiting, and then they share
+        a single deadline, so the total time is bound by the slowest PV instead of
+        the number of PVs. Returns the connection status of each PV.
+        """
+        if not len(self.config):
+            return {}
+
+        for name, member in self.config.__members__.items():
+            if name in self._channels:
+                continue
+            channel = channel_pool.acquire(self._get_pv_name(member))
+            with self._lock:
+                self._names[channel.pvname] = name
+                self._status.setdefault(name, False)
+            channel_pool.add_connection_callback(channel, self._on_connection_changed)
+            self._channels[name] = channel
+
+        deadline = time.monotonic() + self.timeout
+        status = {}
+        for name, channel in self._channels.items():
+            remaining = max(0.0, deadline - time.monotonic())
+            status[name] = bool(channel.wait_for_connection(timeout=remaining))
+
+        with self._lock:
+            self._status.update(status)
+            object.__setattr__(self, "_connected", all(self._status.values()))
+
+        return dict(status)
+
+    def disconnect(self) -> None:
+        """Releases all the channels to the pool, the connection is no longer tracked."""
+        while self._channels:
+            _, channel = self._channels.popitem()
+            channel_pool.remove_connection_callback(
+                channel, self._on_connection_changed
+            )
+            channel_pool.release(channel)
+
+    def add_connection_callback(self, callback: Callable[[str, bool], None]) -> None:
+        """Registers a callback to be called with (name, connected) on every connection change."""
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
+
+    def remove_connection_callback(self, callback: Callable[[str, bool], None]) -> None:
+        """Removes a callback registered with add_connection_callback."""
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    def _on_connection_changed(self, pvname: str, conn: bool, **kwargs) -> None:
+        """Updates the status of a PV, runs from the CA thread on every connection change."""
+        with self._lock:
+            name = self._names.get(pvname)
+            if name is None or self._status.get(name) == conn:
                 return None
+            self._status[name] = conn
+            object.__setattr__(self, "_connected", all(self._status.values()))
+
+        for callback in list(self._callbacks):
+            callback(name, conn)
 
-        object.__setattr__(self, "_connected", True)
+    @staticmethod
+    def _get_pv_name(member: Enum) -> str:
+        """Returns the PV name of a config member."""
+        if not len(member.value) > 2:
+            return member.value[0]
+        return member.value
 
     @property
     def connected(self) -> bool:
         return self._connected
+
+    @property
+    def status(self) -> Dict[str, bool]:
+        return dict(self._status)
+
+    @property
+    def failed(self) -> Dict[str, str]:
+        """Returns the names and PVs of all the channels that failed to connect."""
+        return {
+            name: self._get_pv_name(self.config[name])
+            for name, connected in self._status.items()
+            if not connected
+        }
@@ -34,7 +34,8 @@ class EventFilterModel(QObject):
     def eventFilter(self, widget: QLineEdit, event: QEvent) -> bool:
         # Make available only for FocusOut events.
         if event.type() == QEvent.FocusOut:
-            if not self.stage.moving:
+            # Keep the placeholder until the first readback arrives
+            if not self.stage.moving and self.stage.readback is not None:
                 widget.setText(str("{0:.4f}".format(self.stage.readback)))
 
         return False
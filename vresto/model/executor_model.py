@@ -0,0 +1,232 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import threading
+from enum import IntEnum
+from qtpy.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, Signal
+from typing import Any, Callable, Optional, Set
+
+
+class TaskPriority(IntEnum):
+    """Priorities of the executor tasks, higher values run first."""
+
+    HOUSEKEEPING = 0
+    READBACK = 1
+    MOTION = 2
+
+
+class TaskModel(QObject):
+    """
+    A task submitted to the executor.
+
+    The result or the error is delivered through the finished and failed signals,
+    which are received on the GUI thread. A job can finish before submit returns,
+    so they are connected through the callbacks of submit. Cancelling a task that
+    has not started prevents it from running, a running task can check the
+    cancelled property of TaskModel.current() and return early.
+    """
+
+    finished: Signal = Signal(object)
+    failed: Signal = Signal(object)
+    cancelled: Signal = Signal()
+
+    _current = threading.local()
+
+    def __init__(
+        self, method: Callable, args: Any, kwargs: dict, priority: TaskPriority
+    ) -> None:
+        super(TaskModel, self).__init__()
+
+        self._method = method
+        self._args = args
+        self._kwargs = kwargs
+        self._priority = priority
+
+        self._cancel_requested = threading.Event()
+        self._done = threading.Event()
+        self._result: Any = None
+        self._exception: Optional[BaseException] = None
+
+        # Deliver the signals on the GUI thread
+        application = QCoreApplication.instance()
+        if application is not None:
+            self.moveToThread(application.thread())
+
+    @classmethod
+    def current(cls) -> Optional["TaskModel"]:
+        """Returns the task running on the current thread, if any."""
+        return getattr(cls._current, "task", None)
+
+    def cancel(self) -> None:
+        """Requests the cancellation of the task."""
+        self._cancel_requested.set()
+
+    def run(self) -> None:
+        """Runs the task, called by the executor on a pool thread."""
+        if self._cancel_requested.is_set():
+            self._drop()
+            return None
+
+        TaskModel._current.task = self
+        try:
+            self._result = self._method(*self._args, **self._kwargs)
+        except Exception as error:
+            self._exception = error
+        finally:
+            TaskModel._current.task = None
+            self._done.set()
+
+        if self._exception is not None:
+            self.failed.emit(self._exception)
+        elif self._cancel_requested.is_set():
+            self.cancelled.emit()
+        else:
+            self.finished.emit(self._result)
+
+    def _drop(self) -> None:
+        """Finishes the task as cancelled without running it."""
+        self._cancel_requested.set()
+        self._done.set()
+        self.cancelled.emit()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the task is done, returns False on timeout."""
+        return self._done.wait(timeout)
+
+    @property
+    def priority(self) -> TaskPriority:
+        return self._priority
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancel_requested.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def result(self) -> Any:
+        return self._result
+
+    @property
+    def exception(self) -> Optional[BaseException]:
+        return self._exception
+
+
+class _TaskRunnable(QRunnable):
+    """Runs a task on the thread pool and keeps the executor counters."""
+
+    def __init__(self, task: TaskModel, executor: "ExecutorModel") -> None:
+        super(_TaskRunnable, self).__init__()
+
+        self._task = task
+        self._executor = executor
+
+    def run(self) -> None:
+        # The task was dropped by the shutdown of the executor
+        if not self._executor._task_started(self._task):
+            return None
+        try:
+            self._task.run()
+        finally:
+            self._executor._task_finished()
+
+
+class ExecutorModel:
+    """
+    Shared executor, runs short jobs on a fixed pool of threads by priority.
+
+    Motion and stop jobs run before readback jobs, and readback jobs before
+    housekeeping jobs. The pool reuses its threads, so a job does not cost a new
+    OS thread.
+    """
+
+    def __init__(self, max_threads: Optional[int] = 4) -> None:
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(max_threads)
+
+        self._lock = threading.Lock()
+        self._queued: Set[TaskModel] = set()
+        self._active: int = 0
+
+    def submit(
+        self,
+        method: Callable,
+        *args,
+        priority: Optional[TaskPriority] = TaskPriority.READBACK,
+        on_finished: Optional[Callable[[Any], None]] = None,
+        on_failed: Optional[Callable[[BaseException], None]] = None,
+        **kwargs,
+    ) -> TaskModel:
+        """
+        Submits a job to the executor and returns its task. The callbacks receive the
+        result or the error on the GUI thread, they are connected before the job
+        starts so a short job cannot finish before they are.
+        """
+        task = TaskModel(method=method, args=args, kwargs=kwargs, priority=priority)
+        if on_finished is not None:
+            task.finished.connect(on_finished)
+        if on_failed is not None:
+            task.failed.connect(on_failed)
+        runnable = _TaskRunnable(task=task, executor=self)
+
+        with self._lock:
+            self._queued.add(task)
+        self._pool.start(runnable, int(priority))
+
+        return task
+
+    def shutdown(self, timeout: Optional[float] = 3.0) -> bool:
+        """
+        Cancels the queued jobs and waits for the running ones, returns False on
+        timeout. The tasks of the queued jobs are done and emit cancelled.
+        """
+        self._pool.clear()
+        with self._lock:
+            dropped = list(self._queued)
+            self._queued.clear()
+
+        for task in dropped:
+            task._drop()
+        return self._pool.waitForDone(int(timeout * 1000))
+
+    def _task_started(self, task: TaskModel) -> bool:
+        """Marks the task as running, returns False if it was dropped."""
+        with self._lock:
+            if task not in self._queued:
+                return False
+            self._queued.discard(task)
+            self._active += 1
+            return True
+
+    def _task_finished(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+    @property
+    def queued(self) -> int:
+        """Returns the number of jobs waiting for a thread."""
+        return len(self._queued)
+
+    @property
+    def active(self) -> int:
+        """Returns the number of jobs running."""
+        return self._active
@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import itertools
+import threading
+import time
+from qtpy.QtCore import QObject, QTimer
+from typing import Any, Callable, Dict, Optional
+
+from vresto.model.metrics_model import metrics
+
+# Marks a receiver that has not been delivered any value yet
+_empty = object()
+
+
+class ReadbackMailboxModel(QObject):
+    """
+    Latest-value mailbox between the CA thread and the widgets.
+
+    Readbacks can be posted from any thread, only the latest value of every receiver
+    is kept. The values are delivered on the thread of the mailbox at a fixed rate,
+    and only if they differ from the last value delivered, so the GUI load does not
+    depend on how fast the IOC publishes.
+    """
+
+    _shared: Optional["ReadbackMailboxModel"] = None
+
+    def __init__(self, rate: Optional[float] = 30.0) -> None:
+        super(ReadbackMailboxModel, self).__init__()
+
+        self._lock = threading.Lock()
+        self._keys = itertools.count()
+        self._receivers: Dict[int, Callable[[Any], None]] = {}
+        self._delivered: Dict[int, Any] = {}
+        self._mailbox: Dict[int, Any] = {}
+
+        # Counters
+        self._posted = 0
+        self._deliveries = 0
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.drain)
+        self.rate = rate
+
+    @classmethod
+    def shared(cls) -> "ReadbackMailboxModel":
+        """Returns the mailbox shared by the widgets, created on the first call on the GUI thread."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def subscribe(self, receiver: Callable[[Any], None]) -> int:
+        """Registers a receiver and returns the key to post its values with."""
+        key = next(self._keys)
+        with self._lock:
+            self._receivers[key] = receiver
+            self._delivered[key] = _empty
+        if not self._timer.isActive():
+            self._timer.start()
+        return key
+
+    def unsubscribe(self, key: int) -> None:
+        """Removes a receiver registered with subscribe, pending values are dropped."""
+        with self._lock:
+            self._receivers.pop(key, None)
+            self._delivered.pop(key, None)
+            self._mailbox.pop(key, None)
+            empty = not self._receivers
+        if empty:
+            self._timer.stop()
+
+    def post(self, key: int, value: Any) -> None:
+        """Posts a value from any thread, replacing the one not delivered yet."""
+        with self._lock:
+            if key in self._receivers:
+                self._mailbox[key] = value
+                self._posted += 1
+
+    def drain(self) -> None:
+        """Delivers the latest values that changed since the last delivery."""
+        with self._lock:
+            if not self._mailbox:
+                return None
+            mailbox = self._mailbox
+            self._mailbox = {}
+            deliveries = []
+            for key, value in mailbox.items():
+                if key in self._receivers and self._delivered[key] != value:
+                    self._delivered[key] = value
+                    deliveries.append((self._receivers[key], value))
+            self._deliveries += len(deliveries)
+
+        started = time.perf_counter()
+        for receiver, value in deliveries:
+            receiver(value)
+        metrics.record("readback mailbox", "drain", time.perf_counter() - started)
+
+    @property
+    def rate(self) -> float:
+        """The delivery rate in Hz."""
+        return 1000.0 / self._timer.interval()
+
+    @rate.setter
+    def rate(self, value: float) -> None:
+        self._timer.setInterval(max(1, round(1000.0 / value)))
+
+    @property
+    def posted(self) -> int:
+        """The number of values posted."""
+        return self._posted
+
+    @property
+    def deliveries(self) -> int:
+        """The number of values delivered."""
+        return self._deliveries
@@ -18,13 +18,30 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ----------------------------------------------------------------------
 
-from vresto.model import EpicsModel, CorrectionsModel, PathModel
+from vresto.model import (
+    EpicsModel,
+    channel_pool,
+    CorrectionsModel,
+    PathModel,
+    ExecutorModel,
+    metrics,
+    notifications,
+    pv_cache,
+)
 
 
 class MainModel:
     """Base model class that creates necessary sub-models."""
 
     def __init__(self):
+        self.channels = channel_pool
         self.epics = EpicsModel()
         self.corrections = CorrectionsModel()
         self.paths = PathModel()
+        self.executor = ExecutorModel()
+        self.notifications = notifications
+        self.metrics = metrics
+
+        # Load the warm-start cache before any PV is created
+        self.cache = pv_cache
+        self.cache.load()
@@ -0,0 +1,209 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class LatencyHistogram:
+    """
+    HDR style histogram of latencies in microseconds.
+
+    Values below the sub-bucket count are counted exactly, above it every power of
+    two is split into half the sub-bucket count, so the precision is bound by
+    2 / sub_buckets (about 6% with the default 32) at any magnitude.
+    """
+
+    def __init__(self, sub_bucket_bits: Optional[int] = 5) -> None:
+        self._bits = sub_bucket_bits
+        self._sub_buckets = 1 << sub_bucket_bits
+        self._half = self._sub_buckets >> 1
+        self._counts: List[int] = []
+        self._count = 0
+        self._total = 0
+        self._min: Optional[int] = None
+        self._max = 0
+
+    def _index(self, value: int) -> int:
+        if value < self._sub_buckets:
+            return value
+        shift = value.bit_length() - self._bits
+        return (
+            self._sub_buckets + (shift - 1) * self._half + (value >> shift) - self._half
+        )
+
+    def _lowest(self, index: int) -> int:
+        """Returns the lowest value counted by the bucket."""
+        if index < self._sub_buckets:
+            return index
+        shift, offset = divmod(index - self._sub_buckets, self._half)
+        return (offset + self._half) << (shift + 1)
+
+    def record(self, microseconds: float) -> None:
+        value = max(0, int(microseconds))
+        index = self._index(value)
+        if index >= len(self._counts):
+            self._counts.extend([0] * (index + 1 - len(self._counts)))
+        self._counts[index] += 1
+        self._count += 1
+        self._total += value
+        self._min = value if self._min is None else min(self._min, value)
+        self._max = max(self._max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Adds the values of another histogram with the same sub-buckets."""
+        if len(other._counts) > len(self._counts):
+            self._counts.extend([0] * (len(other._counts) - len(self._counts)))
+        for index, count in enumerate(other._counts):
+            self._counts[index] += count
+        self._count += other._count
+        self._total += other._total
+        if other._min is not None:
+            self._min = other._min if self._min is None else min(self._min, other._min)
+        self._max = max(self._max, other._max)
+
+    def percentile(self, percentile: float) -> int:
+        """Returns the value below which the percentile of the values lie, in microseconds."""
+        if not self._count:
+            return 0
+        target = max(1, round(self._count * percentile / 100.0))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= target:
+                return min(self._lowest(index + 1) - 1, self._max)
+        return self._max
+
+    def summary(self) -> Dict[str, float]:
+        """Returns the count, mean, minimum, percentiles and maximum in microseconds."""
+        return {
+            "count": self._count,
+            "mean_us": self._total / self._count if self._count else 0.0,
+            "min_us": self._min or 0,
+            "p50_us": self.percentile(50),
+            "p90_us": self.percentile(90),
+            "p99_us": self.percentile(99),
+            "p999_us": self.percentile(99.9),
+            "max_us": self._max,
+        }
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+
+class MetricsModel:
+    """
+    Counters and latency histograms of the PV operations, keyed by PV and operation.
+
+    The operations recorded are connect (from the creation of the channel to the
+    first connection), move (issuing a move, rejected moves are counted as errors),
+    put (the put call), motion (from the put to the end of the motion), monitor
+    (the duration of the monitor callbacks) and drain (the readback mailbox delivery
+    to the widgets).
+    Recording takes a lock and a histogram update, cheap enough to stay enabled.
+    """
+
+    def __init__(self, enabled: Optional[bool] = True) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+
+    def record(self, pv: str, operation: str, seconds: float) -> None:
+        """Records the duration of an operation on the PV."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            histogram = self._histograms.get((pv, operation))
+            if histogram is None:
+                histogram = self._histograms[(pv, operation)] = LatencyHistogram()
+            histogram.record(seconds * 1e6)
+
+    def error(self, pv: str, operation: str) -> None:
+        """Counts a failed operation on the PV."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._errors[(pv, operation)] = self._errors.get((pv, operation), 0) + 1
+
+    @contextmanager
+    def timer(self, pv: str, operation: str) -> Iterator[None]:
+        """Records the duration of the with block, exceptions are counted as errors."""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.error(pv, operation)
+            raise
+        finally:
+            self.record(pv, operation, time.perf_counter() - started)
+
+    def summary(
+        self, pv: Optional[str] = None
+    ) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Returns the summary of every operation of every PV, or of the given PV only."""
+        with self._lock:
+            keys = set(self._histograms) | set(self._errors)
+            summary: Dict[str, Dict[str, Dict[str, float]]] = {}
+            for name, operation in sorted(keys):
+                if pv is not None and name != pv:
+                    continue
+                histogram = self._histograms.get((name, operation), LatencyHistogram())
+                entry = histogram.summary()
+                entry["errors"] = self._errors.get((name, operation), 0)
+                summary.setdefault(name, {})[operation] = entry
+            return summary
+
+    def operations(self) -> Dict[str, Dict[str, float]]:
+        """Returns the summary of every operation, over all the PVs."""
+        with self._lock:
+            merged: Dict[str, LatencyHistogram] = {}
+            for (_, operation), histogram in self._histograms.items():
+                target = merged.setdefault(operation, LatencyHistogram())
+                target.merge(histogram)
+            errors: Dict[str, int] = {}
+            for (_, operation), count in self._errors.items():
+                merged.setdefault(operation, LatencyHistogram())
+                errors[operation] = errors.get(operation, 0) + count
+
+            operations = {}
+            for operation, histogram in merged.items():
+                operations[operation] = histogram.summary()
+                operations[operation]["errors"] = errors.get(operation, 0)
+            return operations
+
+    def reset(self) -> None:
+        """Clears all the counters and histograms."""
+        with self._lock:
+            self._histograms.clear()
+            self._errors.clear()
+
+    def dump(self, path: str) -> None:
+        """Writes the summaries by operation and by PV to a JSON file."""
+        report = {"operations": self.operations(), "pvs": self.summary()}
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+metrics = MetricsModel()
@@ -0,0 +1,219 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Notification:
+    """A message to be shown to the user."""
+
+    message: str = field(init=True, repr=True, compare=True)
+    level: str = field(init=True, repr=True, compare=True, default="error")
+    repeated: int = field(init=True, repr=True, compare=False, default=0)
+    timestamp: float = field(init=True, repr=False, compare=False, default=0.0)
+
+    @property
+    def text(self) -> str:
+        if self.repeated:
+            return f"{self.message} (repeated {self.repeated} times)"
+        return self.message
+
+
+class NotificationModel:
+    """
+    Thread-safe notification center.
+
+    Messages can be posted from any thread and are passed on to the listeners
+    without blocking. The same message is shown at most once per repeat interval,
+    with the number of suppressed repeats, which are passed on by themselves if
+    the message is not posted again. No more than rate_limit messages are passed
+    on per second. The messages over the rate limit are queued, up to
+    max_queued, and passed on from a timer thread as the rate limit allows. The
+    GUI listener is expected to hand the messages over to the GUI thread.
+    """
+
+    def __init__(
+        self,
+        repeat_interval: Optional[float] = 10.0,
+        rate_limit: Optional[int] = 5,
+        max_queued: Optional[int] = 100,
+    ) -> None:
+        self._repeat_interval = repeat_interval
+        self._rate_limit = rate_limit
+        self._max_queued = max_queued
+
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[Notification], None]] = []
+        self._last_shown: Dict[Tuple[str, str], float] = {}
+        self._suppressed: Dict[Tuple[str, str], int] = {}
+        # Messages waiting for the rate limit, in order, with their repeats
+        self._queued: Dict[Tuple[str, str], int] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._pruned: float = 0.0
+        self._window_start: float = 0.0
+        self._window_count: int = 0
+        self._dropped: int = 0
+
+    def add_listener(self, callback: Callable[[Notification], None]) -> None:
+        """Registers a callback to receive the notifications."""
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Notification], None]) -> None:
+        """Removes a callback registered with add_listener."""
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def post(self, message: str, level: Optional[str] = "error") -> bool:
+        """
+        Posts a message, returns False if it was suppressed as a repeat or held back
+        by the rate limit. Messages held back are passed on later, unless the queue
+        is full.
+        """
+        key = (level, message)
+        now = time.monotonic()
+
+        with self._lock:
+            self._prune(now, key)
+
+            if key in self._queued:
+                self._queued[key] += 1
+                return False
+
+            last_shown = self._last_shown.get(key)
+            if last_shown is not None and now - last_shown < self._repeat_interval:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return False
+
+            # Queue behind the messages already waiting, so the order is kept
+            if self._queued or not self._reserve(now):
+                if len(self._queued) < self._max_queued:
+                    self._queued[key] = self._suppressed.pop(key, 0)
+                    self._schedule_flush(now)
+                else:
+                    self._dropped += 1
+                return False
+
+            notification = self._notification(key, now, self._suppressed.pop(key, 0))
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            listener(notification)
+
+        return True
+
+    def _flush(self) -> None:
+        """Passes on the queued messages that the rate limit allows, runs on the timer."""
+        now = time.monotonic()
+        notifications = []
+
+        with self._lock:
+            self._timer = None
+            while self._queued and self._reserve(now):
+                key = next(iter(self._queued))
+                notifications.append(
+                    self._notification(key, now, self._queued.pop(key))
+                )
+            if self._queued:
+                self._schedule_flush(now)
+            listeners = list(self._listeners)
+
+        for notification in notifications:
+            for listener in listeners:
+                listener(notification)
+
+    def _schedule_flush(self, now: float) -> None:
+        """Starts the timer of the next flush, when the window opens. Must hold the lock."""
+        if self._timer is not None:
+            return None
+
+        delay = max(self._window_start + 1.0 - now, 0.01)
+        self._timer = threading.Timer(delay, self._flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _reserve(self, now: float) -> bool:
+        """Counts a message in the window, False over the rate limit. Must hold the lock."""
+        if now - self._window_start >= 1.0:
+            self._window_start = now
+            self._window_count = 0
+        if self._window_count >= self._rate_limit:
+            return False
+        self._window_count += 1
+        return True
+
+    def _notification(
+        self, key: Tuple[str, str], now: float, repeated: int
+    ) -> Notification:
+        """Marks the message as shown and returns its notification. Must hold the lock."""
+        self._last_shown[key] = now
+        level, message = key
+        return Notification(
+            message=message, level=level, repeated=repeated, timestamp=time.time()
+        )
+
+    def _prune(self, now: float, posted: Tuple[str, str]) -> None:
+        """
+        Forgets the messages shown before the repeat interval. Their suppressed repeats
+        are queued as a notification with the count, except for the message being
+        posted, which reports them itself. Must hold the lock.
+        """
+        if now - self._pruned < self._repeat_interval:
+            return None
+
+        self._pruned = now
+        expired = [
+            key
+            for key, shown in self._last_shown.items()
+            if now - shown >= self._repeat_interval
+        ]
+        for key in expired:
+            del self._last_shown[key]
+            if key == posted or key not in self._suppressed:
+                continue
+
+            repeated = self._suppressed.pop(key)
+            if key in self._queued:
+                self._queued[key] += repeated
+            elif len(self._queued) < self._max_queued:
+                self._queued[key] = repeated
+                self._schedule_flush(now)
+            else:
+                self._dropped += 1
+
+    @property
+    def dropped(self) -> int:
+        """Returns the number of messages dropped because the queue was full."""
+        return self._dropped
+
+    @property
+    def queued(self) -> int:
+        """Returns the number of messages waiting for the rate limit."""
+        return len(self._queued)
+
+
+# Process-wide notification center, the models post to it from any thread
+notifications = NotificationModel()
@@ -20,6 +20,18 @@
 
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
+
+# The assets live inside the package, so they are found the same way from a source
+# checkout, an installed package or a frozen build, whatever the working directory.
+_package_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@lru_cache(maxsize=None)
+def _read_asset(path: str) -> str:
+    """Reads an asset file once, later calls are served from the process-wide cache."""
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
 
 
 @dataclass(frozen=True, slots=True)
@@ -31,12 +43,18 @@ class PathModel:
     _icon_path: str = field(init=False, compare=False, repr=False)
 
     def __post_init__(self) -> None:
-        object.__setattr__(
-            self, "_assets_path", os.path.join(os.getcwd(), "vresto/assets")
-        )
+        object.__setattr__(self, "_assets_path", os.path.join(_package_path, "assets"))
         object.__setattr__(self, "_qss_path", os.path.join(self._assets_path, "qss"))
         object.__setattr__(self, "_icon_path", os.path.join(self._assets_path, "icons"))
 
+    def icon(self, name: str) -> str:
+        """Returns the path of an icon."""
+        return os.path.join(self._icon_path, name)
+
+    def stylesheet(self, name: str = "main.qss") -> str:
+        """Returns the content of a stylesheet, read from disk only once per process."""
+        return _read_asset(os.path.join(self._qss_path, name))
+
     @property
     def qss_path(self) -> str:
         return self._qss_path
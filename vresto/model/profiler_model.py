@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+class StartupProfilerModel:
+    """Records the duration of the startup phases, phases can be timed from any thread."""
+
+    def __init__(self) -> None:
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._started: Dict[str, float] = {}
+        self._phases: Dict[str, float] = {}
+
+    def start(self, name: str) -> None:
+        """Starts timing a phase."""
+        with self._lock:
+            self._started[name] = time.perf_counter()
+
+    def stop(self, name: str) -> Optional[float]:
+        """Stops timing a phase and returns its duration, None if the phase was not started."""
+        with self._lock:
+            started = self._started.pop(name, None)
+            if started is None:
+                return None
+            self._phases[name] = time.perf_counter() - started
+            return self._phases[name]
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Times the phase of the with block."""
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name)
+
+    def finished(self, *names: str) -> bool:
+        """Returns True if all the given phases have been timed."""
+        with self._lock:
+            return all(name in self._phases for name in names)
+
+    def summary(self) -> str:
+        """Returns a single line with the duration of every phase."""
+        phases = ", ".join(
+            f"{name} {duration:.3f} s" for name, duration in self.phases.items()
+        )
+        return f"Startup: {phases} (total {self.elapsed:.3f} s)"
+
+    def dump(self, path: str) -> None:
+        """Writes the phases and the total time to a JSON file."""
+        with open(path, "w") as file:
+            json.dump({"phases": self.phases, "total": self.elapsed}, file, indent=2)
+
+    @property
+    def phases(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._phases)
+
+    @property
+    def elapsed(self) -> float:
+        """Returns the time since the profiler was created."""
+        return time.perf_counter() - self._origin
@@ -18,17 +18,143 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ----------------------------------------------------------------------
 
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from epics import caget, caput, camonitor, camonitor_clear
-from typing import Optional
+from enum import Enum
+from epics import dbr
+from epics.pv import PV
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple
+
+from vresto.model.cache_model import pv_cache
+from vresto.model.channel_model import channel_pool, filtered_name
+from vresto.model.metrics_model import metrics
+from vresto.model.notification_model import notifications
+from vresto.model.scheduler_model import ScheduledJob, SchedulerModel
+
+# Sends the pending targets, CA calls are not allowed from the CA callback thread
+_dispatcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vresto-pv")
+_dispatched: int = 0
+_dispatcher_lock = threading.Lock()
+
+# Times out the motions of all the PVs, its thread is started by the first motion
+_watchdog = SchedulerModel()
+_watchdog_thread: Optional[threading.Thread] = None
+_watchdog_lock = threading.Lock()
+
+
+def _watch(pv: "PVModel", motion: Future, timeout: float) -> ScheduledJob:
+    """Schedules the timeout of the motion, the PV is referenced weakly."""
+    global _watchdog_thread
+    with _watchdog_lock:
+        if _watchdog_thread is None:
+            _watchdog_thread = threading.Thread(
+                target=_watchdog.run, name="vresto-watchdog", daemon=True
+            )
+            _watchdog_thread.start()
+
+    return _watchdog.add_job(_time_out, args=(weakref.ref(pv), motion), delay=timeout)
+
+
+def _time_out(reference: weakref.ref, motion: Future) -> None:
+    pv = reference()
+    if pv is not None:
+        pv._time_out_motion(motion)
+
+
+def _dispatch(send: Callable, *args) -> None:
+    """Submits a send to the dispatcher, and counts it until it is done."""
+    global _dispatched
+    with _dispatcher_lock:
+        _dispatched += 1
+    try:
+        future = _dispatcher.submit(send, *args)
+    except RuntimeError:
+        _sent()
+        raise
+    future.add_done_callback(_sent)
+
+
+def _sent(future: Optional[Future] = None) -> None:
+    global _dispatched
+    with _dispatcher_lock:
+        _dispatched -= 1
+
+
+def motion_backlog() -> Tuple[int, int]:
+    """
+    Returns the number of targets waiting to be sent, and the number of motions
+    waiting to be done, the ones with a timeout.
+    """
+    return _dispatched, _watchdog.pending
+
 
-from vresto.widget.custom import MsgBox
+def shutdown_motions() -> None:
+    """
+    Drops the targets waiting to be sent and stops the motion timeouts, called at
+    exit. A send in progress is not waited for.
+    """
+    _dispatcher.shutdown(wait=False, cancel_futures=True)
+    _watchdog.stop()
+
+
+@dataclass(frozen=True)
+class SubscriptionProfile:
+    """
+    How the readback of a PV is subscribed: the DBE event mask, and the deadband
+    below which value changes are not sent by the IOC (dbnd channel filter).
+    """
+
+    role: str
+    mask: int
+    deadband: Optional[float] = None
+
+
+# Subscription profiles by role, display changes below half the displayed digit are not needed
+subscription_profiles: Dict[str, SubscriptionProfile] = {
+    "display": SubscriptionProfile("display", dbr.DBE_VALUE | dbr.DBE_ALARM, 0.5e-4),
+    "control": SubscriptionProfile("control", dbr.DBE_VALUE | dbr.DBE_ALARM),
+    "logging": SubscriptionProfile("logging", dbr.DBE_LOG | dbr.DBE_ALARM),
+}
+
+
+class MotionState(Enum):
+    """The motion states of a PV."""
+
+    IDLE = 0
+    REQUESTED = 1
+    MOVING = 2
 
 
 @dataclass(frozen=False)
 class PVModel(ABC):
-    """Abstract class used to define a PV."""
+    """
+    Abstract class used to define a PV.
+
+    Every move returns a Future that resolves to True when the motion is done, or
+    to False if the move was rejected or superseded. The motion is done when the
+    put completes or, for motor records, when the DMOV field goes back to 1.
+    Moves requested during a motion are queued, only the latest one is kept. A
+    motion that is not done within motion_timeout seconds resolves to False, along
+    with the pending target, and the PV goes back to idle. None disables the timeout.
+    A move that cannot be sent, because the channel is disconnected, resolves to
+    False right away.
+
+    Creating a PV does not wait for the IOC. The readback is None until the first
+    monitor event arrives, and the readback callbacks are called, from the CA
+    thread, every time a new readback arrives. If the PV is in the warm-start
+    cache, the readback starts with the cached value and is marked as stale until
+    live data arrives.
+
+    The readback is subscribed with the profile of the role of the PV, the deadband
+    overrides the one of the profile. Deadbands are sent to the IOC as dbnd channel
+    filters, unless channel_filters is disabled, and are applied on the client too.
+    The limits and DMOV are always subscribed with the control profile. All the
+    channels are acquired from the shared channel pool and released on deletion.
+    """
 
     pv: str = field(init=True, repr=True, compare=False)
     movable: bool = field(init=True, repr=True, compare=False)
@@ -38,9 +164,46 @@ class PVModel(ABC):
         init=True, default=False, repr=True, compare=False
     )
     monitor: Optional[bool] = field(init=True, default=False, repr=True, compare=False)
+    role: Optional[str] = field(init=True, default="display", repr=True, compare=False)
+    deadband: Optional[float] = field(init=True, default=None, repr=True, compare=False)
+    motion_timeout: Optional[float] = field(
+        init=True, default=120.0, repr=True, compare=False
+    )
 
     _rbv_string: str = field(init=False, repr=True, compare=False)
-    _moving: bool = field(init=False, repr=False, compare=False, default=True)
+    _state: MotionState = field(
+        init=False, repr=False, compare=False, default=MotionState.IDLE
+    )
+    _motion: Optional[Future] = field(
+        init=False, repr=False, compare=False, default=None
+    )
+    _pending: Optional[Tuple[Any, Future]] = field(
+        init=False, repr=False, compare=False, default=None
+    )
+    _timeout: Optional[ScheduledJob] = field(
+        init=False, repr=False, compare=False, default=None
+    )
+    _lock: threading.RLock = field(
+        init=False, repr=False, compare=False, default_factory=threading.RLock
+    )
+    _connected: bool = field(init=False, repr=False, compare=False, default=False)
+    _stale: bool = field(init=False, repr=False, compare=False, default=False)
+    _timestamp: Optional[float] = field(
+        init=False, repr=False, compare=False, default=None
+    )
+    _monitors: List[Tuple[PV, int]] = field(
+        init=False, repr=False, compare=False, default_factory=list
+    )
+    _channels: Dict[str, PV] = field(
+        init=False, repr=False, compare=False, default_factory=dict
+    )
+    _readback_callbacks: List[Callable[[Any], None]] = field(
+        init=False, repr=False, compare=False, default_factory=list
+    )
+
+    _instances: ClassVar[weakref.WeakValueDictionary] = weakref.WeakValueDictionary()
+    # Disable for IOCs older than EPICS base 3.15, which do not support channel filters
+    channel_filters: ClassVar[bool] = True
 
     @abstractmethod
     def __post_init__(self) -> None:
@@ -57,97 +220,468 @@ class PVModel(ABC):
             value_string = self.pv
         object.__setattr__(self, "_rbv_string", value_string)
 
+    @property
+    def profile(self) -> SubscriptionProfile:
+        """The subscription profile of the readback."""
+        return subscription_profiles[self.role]
+
+    @property
+    def readback_deadband(self) -> Optional[float]:
+        """The deadband of the readback, the one of the PV or else the one of the profile."""
+        return self.deadband if self.deadband is not None else self.profile.deadband
+
+    @classmethod
+    def _filtered_name(cls, pv: str, deadband: Optional[float]) -> str:
+        """Returns the channel name with the dbnd filter for the deadband, if enabled."""
+        return filtered_name(pv, deadband if cls.channel_filters else None)
+
+    def _add_monitor(
+        self,
+        pv: str,
+        callback: Callable,
+        form: str = "time",
+        profile: Optional[SubscriptionProfile] = None,
+        deadband: Optional[float] = None,
+    ) -> PV:
+        """
+        Adds a monitor to the given PV without waiting for the connection, the callback
+        receives the first value once connected. The subscription uses the event mask
+        of the profile, the control profile by default, and the deadband as a channel
+        filter. All the monitors are cleared on deletion.
+        """
+        profile = profile if profile is not None else subscription_profiles["control"]
+        channel, index = channel_pool.monitor(
+            self._filtered_name(pv, deadband),
+            callback,
+            form=form,
+            mask=profile.mask,
+        )
+
+        self._monitors.append((channel, index))
+        PVModel._instances[id(self)] = self
+        return channel
+
+    def _channel(self, pv: str) -> PV:
+        """Returns the channel used to write to the given PV, acquired from the pool once."""
+        channel = self._channels.get(pv)
+        if channel is None:
+            channel = channel_pool.acquire(pv)
+            self._channels[pv] = channel
+            PVModel._instances[id(self)] = self
+        return channel
+
+    def _monitor_readback(self, pv: str, form: str = "time") -> None:
+        """Monitors the readback PV with the profile of the role and tracks its connection."""
+        channel = self._add_monitor(
+            pv,
+            callback=self._monitor_pv,
+            form=form,
+            profile=self.profile,
+            deadband=self.readback_deadband,
+        )
+        channel_pool.add_connection_callback(channel, self._monitor_connection)
+        object.__setattr__(self, "_connected", channel.connected)
+
+    def _monitor_connection(self, conn: bool, **kwargs) -> None:
+        object.__setattr__(self, "_connected", conn)
+
+    def _load_cache(self) -> Optional[Dict[str, Any]]:
+        """Pre-populates the readback from the warm-start cache, returns the cached values."""
+        cached = pv_cache.get(self.pv)
+        if cached is None or cached.get("readback") is None:
+            return None
+
+        object.__setattr__(self, "readback", cached["readback"])
+        object.__setattr__(self, "_timestamp", cached.get("timestamp"))
+        object.__setattr__(self, "_stale", True)
+        return cached
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """Returns the values to be cached, None if there is no live readback."""
+        if self.readback is None or self._stale:
+            return None
+        return {"pv": self.pv, "readback": self.readback, "timestamp": self._timestamp}
+
+    @classmethod
+    def snapshot_all(cls) -> List[Dict[str, Any]]:
+        """Returns the snapshots of every PV that is still alive and has a live readback."""
+        snapshots = (instance.snapshot() for instance in list(cls._instances.values()))
+        return [snapshot for snapshot in snapshots if snapshot is not None]
+
+    def _set_readback(self, value: Any, timestamp: Optional[float] = None) -> None:
+        """Sets the live readback and calls the readback callbacks."""
+        object.__setattr__(self, "readback", value)
+        object.__setattr__(self, "_timestamp", timestamp)
+        object.__setattr__(self, "_stale", False)
+        for callback in list(self._readback_callbacks):
+            callback(value)
+
+    def add_readback_callback(self, callback: Callable[[Any], None]) -> None:
+        """Registers a callback that receives every new readback, called from the CA thread."""
+        if callback not in self._readback_callbacks:
+            self._readback_callbacks.append(callback)
+
+    def remove_readback_callback(self, callback: Callable[[Any], None]) -> None:
+        """Removes a callback registered with add_readback_callback."""
+        if callback in self._readback_callbacks:
+            self._readback_callbacks.remove(callback)
+
+    def clear_monitors(self) -> None:
+        """Clears all the monitors of the PV and releases its channels to the pool."""
+        while self._monitors:
+            channel, index = self._monitors.pop()
+            channel_pool.remove_connection_callback(channel, self._monitor_connection)
+            channel_pool.unmonitor(channel, index)
+        while self._channels:
+            channel_pool.release(self._channels.popitem()[1])
+
+    @classmethod
+    def clear_all_monitors(cls) -> None:
+        """Clears the monitors of every PV that is still alive."""
+        for instance in list(cls._instances.values()):
+            instance.clear_monitors()
+
+    def _put(self, value: Any, retarget: Optional[bool] = False) -> Future:
+        """
+        Writes the value to the PV and returns a Future for the motion.
+
+        While a motion is in progress the value is kept as the pending target and
+        sent when the motion is done, a newer target replaces an older one. With
+        retarget the value is sent right away and replaces the current motion.
+        Superseded Futures resolve to False.
+        """
+        started = time.perf_counter()
+        future = Future()
+        future.set_running_or_notify_cancel()
+        superseded = []
+
+        with self._lock:
+            if self._pending is not None:
+                superseded.append(self._pending[1])
+                object.__setattr__(self, "_pending", None)
+
+            if self._state is MotionState.IDLE or retarget:
+                if self._motion is not None:
+                    superseded.append(self._motion)
+                if self._state is MotionState.IDLE:
+                    object.__setattr__(self, "_state", MotionState.REQUESTED)
+                object.__setattr__(self, "_motion", future)
+                send = True
+            else:
+                object.__setattr__(self, "_pending", (value, future))
+                send = False
+
+        for motion in superseded:
+            if not motion.done():
+                motion.set_result(False)
+
+        if send:
+            self._send(value, future)
+        metrics.record(self.pv, "move", time.perf_counter() - started)
+        return future
+
+    def _send(self, value: Any, motion: Future) -> None:
+        pv, started = self.pv, time.perf_counter()
+        motion.add_done_callback(
+            lambda _: metrics.record(pv, "motion", time.perf_counter() - started)
+        )
+        if self.motion_timeout is not None:
+            with self._lock:
+                if motion is self._motion:
+                    self._cancel_timeout()
+                    object.__setattr__(
+                        self, "_timeout", _watch(self, motion, self.motion_timeout)
+                    )
+        channel, sent = self._channel(pv), None
+        # A put on a disconnected channel blocks for the connection timeout and never completes
+        if channel.connected:
+            with metrics.timer(pv, "put"):
+                sent = channel.put(
+                    value, callback=self._on_put_complete, callback_data=motion
+                )
+        if sent is None:
+            metrics.error(pv, "put")
+            notifications.post(
+                f"The {self.name or self.pv} is disconnected, the move was not sent."
+            )
+            self._end_motion(done=False, motion=motion)
+
+    def _end_motion(self, done: bool, motion: Optional[Future] = None) -> None:
+        """Resolves the Future of the current motion and sends the pending target, if any."""
+        with self._lock:
+            # Ignore completions of motions that have been superseded
+            if motion is not None and motion is not self._motion:
+                return None
+
+            future = self._motion
+            pending = self._pending
+            object.__setattr__(self, "_pending", None)
+            self._cancel_timeout()
+
+            if pending is None:
+                object.__setattr__(self, "_state", MotionState.IDLE)
+                object.__setattr__(self, "_motion", None)
+            else:
+                object.__setattr__(self, "_state", MotionState.REQUESTED)
+                object.__setattr__(self, "_motion", pending[1])
+
+        if future is not None and not future.done():
+            future.set_result(done)
+
+        if pending is not None:
+            try:
+                _dispatch(self._send, *pending)
+            except RuntimeError:
+                # The dispatcher was shut down at exit
+                self._end_motion(done=False, motion=pending[1])
+
+    def _cancel_timeout(self) -> None:
+        """Cancels the timeout of the current motion. Must hold the lock."""
+        if self._timeout is not None:
+            _watchdog.cancel(self._timeout)
+            object.__setattr__(self, "_timeout", None)
+
+    def _time_out_motion(self, motion: Future) -> None:
+        """Gives up on a motion that is not done, and on the pending target."""
+        with self._lock:
+            if motion is not self._motion:
+                return None
+
+            pending = self._pending
+            object.__setattr__(self, "_pending", None)
+            object.__setattr__(self, "_timeout", None)
+            object.__setattr__(self, "_state", MotionState.IDLE)
+            object.__setattr__(self, "_motion", None)
+
+        metrics.error(self.pv, "motion")
+        notifications.post(f"The motion of the {self.name or self.pv} timed out.")
+
+        for future in (motion, pending[1] if pending is not None else None):
+            if future is not None and not future.done():
+                future.set_result(False)
+
+    def _on_put_complete(self, data: Optional[Future] = None, **kwargs) -> None:
+        self._end_motion(done=True, motion=data)
+
+    def _monitor_dmov(self, **kwargs) -> None:
+        if kwargs["value"]:
+            # A done event can arrive before the motion requested has started
+            if self._state is MotionState.REQUESTED:
+                return None
+            self._end_motion(done=True)
+        else:
+            with self._lock:
+                object.__setattr__(self, "_state", MotionState.MOVING)
+
+    @staticmethod
+    def _resolved(result: bool) -> Future:
+        """Returns a Future that is already resolved with the given result."""
+        future = Future()
+        future.set_result(result)
+        return future
+
+    @property
+    def state(self) -> MotionState:
+        return self._state
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    @property
+    def stale(self) -> bool:
+        return self._stale
+
+    @property
+    def timestamp(self) -> Optional[float]:
+        return self._timestamp
+
     @property
     def moving(self):
-        return self._moving
+        return self._state is not MotionState.IDLE
 
     @moving.setter
     def moving(self, value):
         if isinstance(value, bool):
-            object.__setattr__(self, "_moving", value)
+            if value:
+                with self._lock:
+                    object.__setattr__(self, "_state", MotionState.MOVING)
+            else:
+                self._end_motion(done=False)
 
     def __del__(self) -> None:
-        camonitor_clear(self._rbv_string)
+        self.clear_monitors()
 
 
 @dataclass(slots=True)
 class DoubleValuePV(PVModel):
-    """Used to interact with PVs that work with floats."""
+    """
+    Used to interact with PVs that work with floats.
+
+    Moves are checked against the soft limits received from the LLM and HLM
+    monitors. The limits from the warm-start cache are only advisory, they are
+    returned by low_limit and high_limit until the live ones arrive but are never
+    enforced.
+    """
 
-    readback: float = field(init=False, repr=False, compare=False)
+    motor_record: Optional[bool] = field(
+        init=True, default=True, repr=True, compare=False
+    )
+
+    readback: Optional[float] = field(
+        init=False, repr=False, compare=False, default=None
+    )
+
+    _low_limit: Optional[float] = field(
+        init=False, repr=False, compare=False, default=None
+    )
+    _high_limit: Optional[float] = field(
+        init=False, repr=False, compare=False, default=None
+    )
+    _cached_low_limit: Optional[float] = field(
+        init=False, repr=False, compare=False, default=None
+    )
+    _cached_high_limit: Optional[float] = field(
+        init=False, repr=False, compare=False, default=None
+    )
 
     def __post_init__(self) -> None:
         self._create_rbv_string()
 
+        cached = self._load_cache()
+        if cached is not None and self.limited:
+            object.__setattr__(self, "_cached_low_limit", cached.get("low_limit"))
+            object.__setattr__(self, "_cached_high_limit", cached.get("high_limit"))
+
+        # Connect the channel of the moves with the monitors, instead of on the first move
+        if self.movable:
+            self._channel(self.pv)
+
         if self.monitor:
-            object.__setattr__(self, "readback", round(caget(self._rbv_string), 4))
-            camonitor(self._rbv_string, callback=self._monitor_pv)
+            self._monitor_readback(self._rbv_string)
 
-    def _monitor_pv(self, **kwargs) -> None:
-        object.__setattr__(self, "readback", round(kwargs["value"], 4))
-        object.__setattr__(self, "_moving", True)
+        # Subscribe to the soft limits once, so the limit check in move stays local
+        if self.limited:
+            self._add_monitor(self.pv + ".LLM", callback=self._monitor_low_limit)
+            self._add_monitor(self.pv + ".HLM", callback=self._monitor_high_limit)
 
-    def move(self, value: float, with_limits: Optional[bool] = True) -> None:
-        """Moves the motor."""
+        # Track the motions of the motor record, including the ones started elsewhere
+        if self.movable and self.motor_record:
+            self._add_monitor(self.pv + ".DMOV", callback=self._monitor_dmov)
 
-        if not self.movable:
+    def _monitor_pv(self, **kwargs) -> None:
+        value = round(kwargs["value"], 4)
+        # Applied on the client too, in case the IOC does not support the dbnd filter
+        deadband = self.readback_deadband
+        if (
+            deadband is not None
+            and self.readback is not None
+            and not self._stale
+            and abs(value - self.readback) < deadband
+        ):
             return None
+        self._set_readback(value, kwargs.get("timestamp"))
 
-        if self.moving:
-            return None
+    def _monitor_low_limit(self, **kwargs) -> None:
+        object.__setattr__(self, "_low_limit", kwargs["value"])
+
+    def _monitor_high_limit(self, **kwargs) -> None:
+        object.__setattr__(self, "_high_limit", kwargs["value"])
+
+    def move(
+        self,
+        value: float,
+        with_limits: Optional[bool] = True,
+        retarget: Optional[bool] = False,
+    ) -> Future:
+        """Moves the motor, returns a Future that resolves when the motion is done."""
+
+        if not self.movable:
+            return self._resolved(False)
 
         if self.limited:
             if with_limits:
-                if value < caget(self.pv + ".LLM"):
-                    MsgBox(msg=f"You reach the high limit of the {self.name}.")
-                    return None
-                elif value > caget(self.pv + ".HLM"):
-                    MsgBox(msg=f"You reach the low limit of the {self.name}.")
-                    return None
-
-        # Check if moving
-        caput(self.pv, value)
+                if self._low_limit is not None and value < self._low_limit:
+                    notifications.post(f"You reach the low limit of the {self.name}.")
+                    metrics.error(self.pv, "move")
+                    return self._resolved(False)
+                elif self._high_limit is not None and value > self._high_limit:
+                    notifications.post(f"You reach the high limit of the {self.name}.")
+                    metrics.error(self.pv, "move")
+                    return self._resolved(False)
+
+        # Only motor records accept a new target in the middle of a motion
+        return self._put(value, retarget=retarget and self.motor_record)
 
     def set_high_limit(self, limit: float) -> None:
         if self.limited:
             value_string = self.pv + ".HLM"
-            caput(value_string, limit)
+            with metrics.timer(value_string, "put"):
+                self._channel(value_string).put(limit)
+            object.__setattr__(self, "_high_limit", limit)
 
     def set_low_limit(self, limit: float) -> None:
         if self.limited:
             value_string = self.pv + ".LLM"
-            caput(value_string, limit)
+            with metrics.timer(value_string, "put"):
+                self._channel(value_string).put(limit)
+            object.__setattr__(self, "_low_limit", limit)
 
     def set_limits(self, high: float, low: float) -> None:
         self.set_high_limit(limit=high)
         self.set_low_limit(limit=low)
 
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        snapshot = PVModel.snapshot(self)
+        if snapshot is not None and self.limited:
+            snapshot["low_limit"] = self.low_limit
+            snapshot["high_limit"] = self.high_limit
+        return snapshot
+
+    @property
+    def low_limit(self) -> Optional[float]:
+        """The live low limit, or the cached one until it arrives."""
+        if self._low_limit is not None:
+            return self._low_limit
+        return self._cached_low_limit
+
+    @property
+    def high_limit(self) -> Optional[float]:
+        """The live high limit, or the cached one until it arrives."""
+        if self._high_limit is not None:
+            return self._high_limit
+        return self._cached_high_limit
+
 
 @dataclass(slots=True)
 class StringValuePV(PVModel):
     """Used to interact with PVs that work with strings."""
 
-    readback: str = field(init=False, repr=False, compare=False)
+    readback: Optional[str] = field(init=False, repr=False, compare=False, default=None)
 
     def __post_init__(self) -> None:
         self._create_rbv_string()
 
+        self._load_cache()
+
+        if self.movable:
+            self._channel(self.pv)
+
+        # The ctrl form carries the enum strings, so char_value needs no extra get
         if self.monitor:
-            object.__setattr__(
-                self, "readback", caget(self._rbv_string, as_string=True)
-            )
-            camonitor(self._rbv_string, callback=self._monitor_pv)
+            self._monitor_readback(self._rbv_string, form="ctrl")
+
+    @property
+    def readback_deadband(self) -> Optional[float]:
+        """Strings have no deadband."""
+        return None
 
     def _monitor_pv(self, **kwargs) -> None:
-        object.__setattr__(self, "readback", kwargs["char_value"])
-        object.__setattr__(self, "_moving", True)
+        self._set_readback(kwargs["char_value"], kwargs.get("timestamp"))
 
-    def move(self, value: str) -> None:
-        """Moves the motor"""
+    def move(self, value: str) -> Future:
+        """Moves the motor, returns a Future that resolves when the put is complete."""
         if not self.movable:
-            return None
-
-        if self.moving:
-            return None
+            return self._resolved(False)
 
-        caput(self.pv, value)
+        return self._put(value)
@@ -0,0 +1,365 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import itertools
+import logging
+import math
+import struct
+import threading
+import time
+from enum import IntEnum
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from vresto.model.channel_model import ChannelKey
+from vresto.model.sim_model import SimChannel
+from vresto.model.transport_model import TransportModel
+
+logger = logging.getLogger(__name__)
+
+_magic = b"VRESTOR1"
+# Time since the start of the recording, event and channel number
+_event = struct.Struct("<dBI")
+_tag = struct.Struct("<B")
+_length = struct.Struct("<I")
+_float = struct.Struct("<d")
+_integer = struct.Struct("<q")
+
+
+class RecordedEvent(IntEnum):
+    """The events of a recording."""
+
+    CHANNEL = 0
+    CONNECTION = 1
+    MONITOR = 2
+    GET = 3
+    PUT = 4
+    PUT_COMPLETE = 5
+
+
+def _encode(value: Any) -> bytes:
+    """Encodes a value as a tag followed by the data."""
+    if value is None:
+        return _tag.pack(0)
+    if isinstance(value, (bool, int)) and not isinstance(value, float):
+        return _tag.pack(2) + _integer.pack(int(value))
+    if isinstance(value, float):
+        return _tag.pack(1) + _float.pack(value)
+    if isinstance(value, (str, bytes)):
+        data = value.encode() if isinstance(value, str) else value
+        return _tag.pack(3) + _length.pack(len(data)) + data
+    try:
+        values = [float(item) for item in value]
+    except (TypeError, ValueError):
+        return _encode(str(value))
+    return (
+        _tag.pack(4)
+        + _length.pack(len(values))
+        + struct.pack(f"<{len(values)}d", *values)
+    )
+
+
+def _decode(data: bytes, offset: int) -> Tuple[Any, int]:
+    """Decodes a value at the offset, returns it with the offset after it."""
+    (tag,) = _tag.unpack_from(data, offset)
+    offset += _tag.size
+    if tag == 0:
+        return None, offset
+    if tag == 1:
+        return _float.unpack_from(data, offset)[0], offset + _float.size
+    if tag == 2:
+        return _integer.unpack_from(data, offset)[0], offset + _integer.size
+
+    (length,) = _length.unpack_from(data, offset)
+    offset += _length.size
+    if tag == 3:
+        return data[offset : offset + length].decode(), offset + length
+    values = list(struct.unpack_from(f"<{length}d", data, offset))
+    return values, offset + length * _float.size
+
+
+def read_recording(path: str) -> Iterator[Tuple[float, RecordedEvent, int, List[Any]]]:
+    """Yields the events of a recording as (time, event, channel number, values)."""
+    with open(path, "rb") as file:
+        data = file.read()
+    if not data.startswith(_magic):
+        raise ValueError(f"{path} is not a vresto recording")
+
+    offset = len(_magic)
+    while offset < len(data):
+        elapsed, event, number = _event.unpack_from(data, offset)
+        offset += _event.size
+        (count,) = _tag.unpack_from(data, offset)
+        offset += _tag.size
+        values = []
+        for _ in range(count):
+            value, offset = _decode(data, offset)
+            values.append(value)
+        yield elapsed, RecordedEvent(event), number, values
+
+
+class _Recorder:
+    """Writes the events to the recording file, from any thread."""
+
+    def __init__(self, path: str) -> None:
+        self._lock = threading.Lock()
+        self._file: Optional[BinaryIO] = open(path, "wb")
+        self._file.write(_magic)
+        self._started = time.monotonic()
+        self._events = 0
+
+    def write(self, event: RecordedEvent, number: int, *values: Any) -> None:
+        data = _event.pack(time.monotonic() - self._started, event, number)
+        data += _tag.pack(len(values)) + b"".join(_encode(value) for value in values)
+        with self._lock:
+            if self._file is not None:
+                self._file.write(data)
+                self._events += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    @property
+    def events(self) -> int:
+        return self._events
+
+
+class _RecordedChannel:
+    """
+    Channel of another transport that records its connection, monitor, get and put
+    events. The connection changes are passed on to its own connection callbacks,
+    with the recorded channel as pv, so the pool finds the channel it created.
+    """
+
+    def __init__(
+        self, channel: Any, recorder: _Recorder, number: int, mask: int
+    ) -> None:
+        self._channel = channel
+        self._recorder = recorder
+        self._number = number
+        self.connection_callbacks: List[Callable] = []
+
+        recorder.write(
+            RecordedEvent.CHANNEL, number, channel.pvname, channel.form, mask
+        )
+        channel.connection_callbacks.append(self._on_connection)
+        channel.add_callback(self._on_monitor, with_ctrlvars=False)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._channel, name)
+
+    def get(self, *args, **kwargs) -> Any:
+        value = self._channel.get(*args, **kwargs)
+        self._recorder.write(RecordedEvent.GET, self._number, value)
+        return value
+
+    def put(
+        self, value: Any, *args, callback: Optional[Callable] = None, **kwargs
+    ) -> Any:
+        self._recorder.write(RecordedEvent.PUT, self._number, value)
+        # Only the puts with a callback ask for a completion, and record it
+        if callback is None:
+            return self._channel.put(value, *args, **kwargs)
+
+        def on_complete(**arguments) -> None:
+            self._recorder.write(RecordedEvent.PUT_COMPLETE, self._number)
+            callback(**arguments)
+
+        return self._channel.put(value, *args, callback=on_complete, **kwargs)
+
+    def _on_connection(self, conn: bool, **kwargs) -> None:
+        self._recorder.write(RecordedEvent.CONNECTION, self._number, int(conn))
+        kwargs["pv"] = self
+        for callback in list(self.connection_callbacks):
+            callback(conn=conn, **kwargs)
+
+    def _on_monitor(self, **kwargs) -> None:
+        self._recorder.write(
+            RecordedEvent.MONITOR,
+            self._number,
+            kwargs.get("value"),
+            kwargs.get("char_value"),
+            kwargs.get("timestamp"),
+        )
+
+
+class RecordingTransportModel(TransportModel):
+    """
+    Transport that records the traffic of another transport to a binary file.
+
+    Every channel creation, connection change, monitor event, get, put and put
+    completion is written with the time since the start of the recording, so the
+    traffic can be fed back with ReplayTransportModel.
+    """
+
+    def __init__(self, transport: TransportModel, path: str) -> None:
+        self.name = f"record {transport.name}"
+        self._transport = transport
+        self._recorder = _Recorder(path)
+        self._numbers = itertools.count()
+        self.path = path
+
+    def create_channel(self, name: str, form: str, mask: int) -> _RecordedChannel:
+        channel = self._transport.create_channel(name, form, mask)
+        return _RecordedChannel(channel, self._recorder, next(self._numbers), mask)
+
+    def finalize(self, timeout: float) -> None:
+        self._transport.finalize(timeout)
+        self._recorder.close()
+        logger.info("Recorded %d events to %s", self._recorder.events, self.path)
+
+
+class _ReplayChannel(SimChannel):
+    """Channel of the replay, only the puts with a callback take a recorded completion."""
+
+    def put(
+        self,
+        value: Any,
+        wait: bool = False,
+        timeout: float = 30.0,
+        callback: Optional[Callable] = None,
+        callback_data: Any = None,
+        **kwargs,
+    ) -> Optional[int]:
+        if callback is not None:
+            return SimChannel.put(
+                self, value, wait, timeout, callback, callback_data, **kwargs
+            )
+        if not self.wait_for_connection(timeout=self._transport.timeout):
+            return None
+        return 1
+
+
+class ReplayTransportModel(TransportModel):
+    """
+    Transport that feeds a recording back to the channels.
+
+    The events are replayed from the creation of the first channel, at the recorded
+    pace times speed, or as fast as possible if speed is infinite. The channels are
+    matched by name, form and event mask. Events of channels that have not been
+    created yet are kept, so a channel created later connects with the last
+    replayed value. Puts are not sent anywhere, the ones with a callback complete
+    with the next recorded put completion of the channel. Unknown channels never
+    connect.
+    """
+
+    name = "replay"
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0) -> None:
+        self.path = path
+        self.speed = speed
+        self.timeout = 5.0
+
+        self._events = list(read_recording(path))
+        self._lock = threading.RLock()
+        self._channels: Dict[ChannelKey, List[SimChannel]] = {}
+        self._state: Dict[ChannelKey, Tuple[Any, str, float]] = {}
+        self._completions: Dict[ChannelKey, List[Callable]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._finished = threading.Event()
+
+    def create_channel(self, name: str, form: str, mask: int) -> SimChannel:
+        channel = _ReplayChannel(self, name, form, mask, (name, form, mask), None)
+        with self._lock:
+            self._channels.setdefault(channel._address, []).append(channel)
+            state = self._state.get(channel._address)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="vresto-replay", daemon=True
+                )
+                self._thread.start()
+
+        if state is not None:
+            channel._connect(*state)
+        return channel
+
+    def finalize(self, timeout: float) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Waits until all the events have been replayed, returns False on timeout."""
+        return self._finished.wait(timeout)
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    def _run(self) -> None:
+        addresses: Dict[int, ChannelKey] = {}
+        started = time.monotonic()
+
+        for elapsed, event, number, values in self._events:
+            if self._stopped.is_set():
+                return None
+            if self.speed is not None and not math.isinf(self.speed):
+                delay = started + elapsed / self.speed - time.monotonic()
+                if delay > 0 and self._stopped.wait(delay):
+                    return None
+
+            if event is RecordedEvent.CHANNEL:
+                addresses[number] = (values[0], values[1], values[2])
+                continue
+
+            address = addresses.get(number)
+            if address is not None:
+                try:
+                    self._replay(address, event, values)
+                except Exception:
+                    logger.exception("Replay of %s failed", address[0])
+
+        self._finished.set()
+
+    def _replay(self, address: ChannelKey, event: RecordedEvent, values: list) -> None:
+        with self._lock:
+            channels = list(self._channels.get(address, ()))
+
+            if event is RecordedEvent.CONNECTION and not values[0]:
+                self._state.pop(address, None)
+            elif event is RecordedEvent.MONITOR:
+                self._state[address] = (values[0], values[1], values[2])
+            elif event is RecordedEvent.PUT_COMPLETE:
+                completions = self._completions.get(address)
+                if completions:
+                    completions.pop(0)()
+                return None
+
+        for channel in channels:
+            if event is RecordedEvent.CONNECTION and not values[0]:
+                channel._disconnected()
+            elif event is RecordedEvent.MONITOR:
+                if channel.connected:
+                    channel._update(*values)
+                else:
+                    channel._connect(*values)
+
+    def _put(self, address: ChannelKey, value: Any, done: Callable) -> None:
+        with self._lock:
+            self._completions.setdefault(address, []).append(done)
+
+    def _detach(self, channel: SimChannel) -> None:
+        with self._lock:
+            channels = self._channels.get(channel._address, [])
+            if channel in channels:
+                channels.remove(channel)
@@ -0,0 +1,144 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(order=True, slots=True)
+class ScheduledJob:
+    """A job of the scheduler, ordered by its deadline."""
+
+    deadline: float = field(init=True, repr=True, compare=True)
+    number: int = field(init=True, repr=False, compare=True)
+    method: Callable = field(init=True, repr=True, compare=False)
+    args: Any = field(init=True, repr=False, compare=False, default=())
+    interval: Optional[float] = field(init=True, repr=True, compare=False, default=None)
+    cancelled: bool = field(init=False, repr=False, compare=False, default=False)
+
+
+class SchedulerModel:
+    """
+    Runs one-shot and periodic jobs on the thread that calls run.
+
+    The thread sleeps on a condition variable until the next deadline, a new job
+    or stop, so it does not wake up while there is nothing to do.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._jobs: List[ScheduledJob] = []
+        self._counter = itertools.count()
+        self._stopped: bool = False
+
+    def add_job(
+        self,
+        method: Callable,
+        args: Any = (),
+        delay: Optional[float] = 0.0,
+        interval: Optional[float] = None,
+    ) -> ScheduledJob:
+        """Schedules a job to run after delay seconds, and then every interval seconds if given."""
+        job = ScheduledJob(
+            deadline=time.monotonic() + delay,
+            number=next(self._counter),
+            method=method,
+            args=args,
+            interval=interval,
+        )
+
+        with self._condition:
+            heapq.heappush(self._jobs, job)
+            self._condition.notify()
+
+        return job
+
+    def cancel(self, job: ScheduledJob) -> None:
+        """Cancels a job, a running job finishes but is not scheduled again."""
+        with self._condition:
+            job.cancelled = True
+            self._condition.notify()
+
+    def wakeup(self) -> None:
+        """Wakes up the scheduler thread to check the jobs."""
+        with self._condition:
+            self._condition.notify()
+
+    def stop(self) -> None:
+        """Stops the scheduler, run returns after the current job finishes."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def run(self) -> None:
+        """Runs the jobs when they are due, until stop is called."""
+        while True:
+            with self._condition:
+                job = self._next_job()
+                if job is None:
+                    return None
+
+            if not job.cancelled:
+                try:
+                    job.method(*job.args)
+                except Exception:
+                    logger.exception("Scheduled job %s failed", job.method)
+
+            if job.interval is not None and not job.cancelled:
+                with self._condition:
+                    job.deadline = max(job.deadline + job.interval, time.monotonic())
+                    job.number = next(self._counter)
+                    heapq.heappush(self._jobs, job)
+
+    def _next_job(self) -> Optional[ScheduledJob]:
+        """Waits for the next due job, returns None when stopped. Must hold the condition."""
+        while not self._stopped:
+            # Discard the cancelled jobs
+            while self._jobs and self._jobs[0].cancelled:
+                heapq.heappop(self._jobs)
+
+            if not self._jobs:
+                self._condition.wait()
+                continue
+
+            remaining = self._jobs[0].deadline - time.monotonic()
+            if remaining <= 0:
+                return heapq.heappop(self._jobs)
+
+            self._condition.wait(timeout=remaining)
+
+        return None
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped
+
+    @property
+    def pending(self) -> int:
+        """Returns the number of jobs waiting to run."""
+        with self._condition:
+            return sum(1 for job in self._jobs if not job.cancelled)
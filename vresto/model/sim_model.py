@@ -0,0 +1,461 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import heapq
+import itertools
+import logging
+import math
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from vresto.model.channel_model import parse_filtered_name
+from vresto.model.transport_model import TransportModel
+
+logger = logging.getLogger(__name__)
+
+# The fields of a simulated motor record
+_motor_fields = ("VAL", "RBV", "DMOV", "LLM", "HLM", "VELO", "ACCL")
+
+
+@dataclass(frozen=False, slots=True)
+class _SimRecord:
+    """A simulated record, every field holds a value."""
+
+    name: str
+    fields: Dict[str, Any] = field(default_factory=dict)
+    enum_strings: Optional[Tuple[str, ...]] = None
+
+    def put(
+        self, transport: "SimTransportModel", name: str, value: Any, done: Callable
+    ) -> None:
+        if self.enum_strings is not None and isinstance(value, str):
+            value = self.enum_strings.index(value)
+        transport._publish(self, name, value)
+        done()
+
+
+@dataclass(frozen=False, slots=True)
+class _SimMotor(_SimRecord):
+    """
+    A simulated motor record. A put to VAL moves the readback RBV with a trapezoidal
+    velocity profile, set by VELO and the acceleration time ACCL, and publishes it at
+    the monitor rate. DMOV is 0 during the motion, the put completes when it is done.
+    Targets outside of the soft limits LLM and HLM are not moved to, unless both
+    limits are 0.
+    """
+
+    rate: float = 50.0
+    _start: float = 0.0
+    _target: float = 0.0
+    _started: float = 0.0
+    _duration: float = 0.0
+    _motion: int = 0
+    _completions: List[Callable] = field(default_factory=list)
+
+    def put(
+        self, transport: "SimTransportModel", name: str, value: Any, done: Callable
+    ) -> None:
+        if name != "VAL":
+            _SimRecord.put(self, transport, name, value, done)
+            return None
+
+        low, high = self.fields["LLM"], self.fields["HLM"]
+        if (low != 0 or high != 0) and not low <= value <= high:
+            done()
+            return None
+
+        self._completions.append(done)
+        self._start = self.position(time.monotonic())
+        self._target = float(value)
+        self._started = time.monotonic()
+        self._duration = self._profile_duration(abs(self._target - self._start))
+        self._motion += 1
+
+        transport._publish(self, "VAL", self._target)
+        if self.fields["DMOV"]:
+            transport._publish(self, "DMOV", 0)
+        transport._schedule(self._started, self._step, transport, self._motion)
+
+    def _acceleration(self) -> float:
+        return self.fields["VELO"] / max(self.fields["ACCL"], 1e-9)
+
+    def _profile_duration(self, distance: float) -> float:
+        """The duration of a motion over the distance, accelerating and decelerating."""
+        velocity, acceleration = self.fields["VELO"], self._acceleration()
+        if distance >= velocity * velocity / acceleration:
+            return distance / velocity + velocity / acceleration
+        return 2.0 * math.sqrt(distance / acceleration)
+
+    def position(self, now: float) -> float:
+        """The position of the motor at the given time."""
+        if self.fields["DMOV"]:
+            return self.fields["RBV"]
+
+        elapsed = min(now - self._started, self._duration)
+        distance = abs(self._target - self._start)
+        velocity, acceleration = self.fields["VELO"], self._acceleration()
+        peak = min(velocity, acceleration * self._duration / 2.0)
+        ramp = peak / acceleration
+
+        if elapsed < ramp:
+            travelled = acceleration * elapsed * elapsed / 2.0
+        elif elapsed < self._duration - ramp:
+            travelled = peak * ramp / 2.0 + peak * (elapsed - ramp)
+        else:
+            remaining = self._duration - elapsed
+            travelled = distance - acceleration * remaining * remaining / 2.0
+
+        direction = 1.0 if self._target >= self._start else -1.0
+        return self._start + direction * min(travelled, distance)
+
+    def _step(self, transport: "SimTransportModel", motion: int) -> None:
+        # A newer motion replaced this one
+        if motion != self._motion:
+            return None
+
+        now = time.monotonic()
+        if now - self._started >= self._duration:
+            transport._publish(self, "RBV", self._target)
+            transport._publish(self, "DMOV", 1)
+            completions, self._completions = self._completions, []
+            for done in completions:
+                done()
+        else:
+            transport._publish(self, "RBV", self.position(now))
+            transport._schedule(now + 1.0 / self.rate, self._step, transport, motion)
+
+
+class SimChannel:
+    """A channel of the simulated and replay transports, with the interface of a pyepics PV."""
+
+    def __init__(
+        self,
+        transport: "SimTransportModel",
+        pvname: str,
+        form: str,
+        mask: int,
+        address: Tuple[str, str],
+        deadband: Optional[float],
+    ) -> None:
+        self.pvname = pvname
+        self.form = form
+        self.mask = mask
+        self.connected = False
+        self.connection_callbacks: List[Callable] = []
+
+        self.value: Any = None
+        self.char_value: Optional[str] = None
+        self.timestamp: Optional[float] = None
+
+        self._transport = transport
+        self._address = address
+        self._deadband = deadband
+        self._sent: Any = None
+        self._callbacks: Dict[int, Callable] = {}
+        self._indices = itertools.count(1)
+        self._connection = threading.Event()
+
+    def add_callback(
+        self, callback: Callable, index: Optional[int] = None, **kwargs
+    ) -> int:
+        index = index if index is not None else next(self._indices)
+        self._callbacks[index] = callback
+        return index
+
+    def remove_callback(self, index: int) -> None:
+        self._callbacks.pop(index, None)
+
+    def run_callback(self, index: int) -> None:
+        callback = self._callbacks.get(index)
+        if callback is not None:
+            callback(**self._arguments())
+
+    def run_callbacks(self) -> None:
+        for index in list(self._callbacks):
+            self.run_callback(index)
+
+    def get(self, as_string: bool = False, **kwargs) -> Any:
+        return self.char_value if as_string else self.value
+
+    def put(
+        self,
+        value: Any,
+        wait: bool = False,
+        timeout: float = 30.0,
+        callback: Optional[Callable] = None,
+        callback_data: Any = None,
+        **kwargs,
+    ) -> Optional[int]:
+        if not self.wait_for_connection(timeout=self._transport.timeout):
+            return None
+
+        completed = threading.Event()
+
+        def done() -> None:
+            completed.set()
+            if callback is not None:
+                callback(pvname=self.pvname, data=callback_data)
+
+        self._transport._put(self._address, value, done)
+        if wait and not completed.wait(timeout):
+            return -1
+        return 1
+
+    def wait_for_connection(self, timeout: Optional[float] = None) -> bool:
+        return self._connection.wait(timeout)
+
+    def disconnect(self, **kwargs) -> None:
+        self._transport._detach(self)
+        self.connected = False
+        self._connection.clear()
+        self._callbacks.clear()
+        self.connection_callbacks.clear()
+
+    def _arguments(self) -> Dict[str, Any]:
+        return {
+            "pvname": self.pvname,
+            "value": self.value,
+            "char_value": self.char_value,
+            "timestamp": self.timestamp,
+            "status": 0,
+            "severity": 0,
+            "pv": self,
+        }
+
+    def _connect(self, value: Any, char_value: str, timestamp: float) -> None:
+        self.value, self.char_value, self.timestamp = value, char_value, timestamp
+        self.connected = True
+        self._connection.set()
+        for callback in list(self.connection_callbacks):
+            callback(pvname=self.pvname, conn=True, pv=self)
+        self._sent = value
+        self.run_callbacks()
+
+    def _disconnected(self) -> None:
+        self.connected = False
+        self._connection.clear()
+        for callback in list(self.connection_callbacks):
+            callback(pvname=self.pvname, conn=False, pv=self)
+
+    def _update(self, value: Any, char_value: str, timestamp: float) -> None:
+        self.value, self.char_value, self.timestamp = value, char_value, timestamp
+        # Changes smaller than the dbnd filter are not sent
+        if (
+            self._deadband is not None
+            and isinstance(value, float)
+            and isinstance(self._sent, float)
+            and abs(value - self._sent) < self._deadband
+        ):
+            return None
+        self._sent = value
+        self.run_callbacks()
+
+
+class SimTransportModel(TransportModel):
+    """
+    In-process simulated transport, with motor records and plain records.
+
+    A single thread plays the role of the CA thread: it connects the channels,
+    applies the puts, moves the motors and calls all the callbacks. Channel names
+    follow the CA ones, record.FIELD with an optional dbnd channel filter, and
+    names without a field refer to VAL. With auto_motors, a motor record is created
+    for every unknown record name, otherwise unknown channels never connect.
+    """
+
+    name = "sim"
+
+    def __init__(
+        self,
+        rate: Optional[float] = 50.0,
+        connect_delay: Optional[float] = 0.0,
+        auto_motors: Optional[bool] = True,
+        timeout: Optional[float] = 5.0,
+    ) -> None:
+        self.rate = rate
+        self.connect_delay = connect_delay
+        self.auto_motors = auto_motors
+        self.timeout = timeout
+
+        self._lock = threading.RLock()
+        self._records: Dict[str, _SimRecord] = {}
+        self._subscribers: Dict[Tuple[str, str], List[SimChannel]] = {}
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._timers: List[Tuple[float, int, Callable, tuple]] = []
+        self._sequence = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def add_motor(
+        self,
+        name: str,
+        position: Optional[float] = 0.0,
+        velocity: Optional[float] = 1.0,
+        acceleration: Optional[float] = 0.2,
+        low_limit: Optional[float] = -100.0,
+        high_limit: Optional[float] = 100.0,
+        rate: Optional[float] = None,
+    ) -> None:
+        """Adds a motor record, rate is the monitor rate of the readback during the motions."""
+        fields = dict(
+            VAL=position,
+            RBV=position,
+            DMOV=1,
+            LLM=low_limit,
+            HLM=high_limit,
+            VELO=velocity,
+            ACCL=acceleration,
+        )
+        motor = _SimMotor(name, fields=fields, rate=rate or self.rate)
+        with self._lock:
+            self._records[name] = motor
+
+    def add_record(
+        self, name: str, value: Any, enum_strings: Optional[Tuple[str, ...]] = None
+    ) -> None:
+        """Adds a record with a single value, an enum if the strings are given."""
+        record = _SimRecord(name, fields={"VAL": value}, enum_strings=enum_strings)
+        with self._lock:
+            self._records[name] = record
+
+    def value(self, name: str) -> Any:
+        """Returns the current value of a field, record.FIELD or record for VAL."""
+        record, name = self._address(name)
+        return self._records[record].fields[name]
+
+    def create_channel(self, name: str, form: str, mask: int) -> SimChannel:
+        base, deadband = parse_filtered_name(name)
+        channel = SimChannel(self, name, form, mask, self._address(base), deadband)
+        with self._lock:
+            self._subscribers.setdefault(channel._address, []).append(channel)
+
+        self._start()
+        self._schedule(time.monotonic() + self.connect_delay, self._connect, channel)
+        return channel
+
+    def finalize(self, timeout: float) -> None:
+        if self._thread is None:
+            return None
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _address(self, name: str) -> Tuple[str, str]:
+        """Returns the record and field of a PV name."""
+        with self._lock:
+            if name in self._records:
+                return name, "VAL"
+            record, _, field_name = name.rpartition(".")
+            if record and field_name.isupper():
+                return record, field_name
+            return name, "VAL"
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="vresto-sim", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            timeout = None
+            if self._timers:
+                timeout = max(0.0, self._timers[0][0] - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+                while item is not None:
+                    self._call(item)
+                    item = self._queue.get_nowait()
+                return None
+            except queue.Empty:
+                pass
+
+            now = time.monotonic()
+            while self._timers and self._timers[0][0] <= now:
+                _, _, method, args = heapq.heappop(self._timers)
+                self._call(method, *args)
+
+    @staticmethod
+    def _call(method: Callable, *args) -> None:
+        try:
+            method(*args)
+        except Exception:
+            logger.exception("Simulated transport call failed")
+
+    def _schedule(self, when: float, method: Callable, *args) -> None:
+        """Runs the method at the given time on the transport thread."""
+        entry = (when, next(self._sequence), method, args)
+        if threading.current_thread() is self._thread:
+            heapq.heappush(self._timers, entry)
+        else:
+            self._queue.put(lambda: heapq.heappush(self._timers, entry))
+
+    def _put(self, address: Tuple[str, str], value: Any, done: Callable) -> None:
+        """Applies a put on the transport thread."""
+
+        def put() -> None:
+            record = self._records.get(address[0])
+            if record is not None:
+                record.put(self, address[1], value, done)
+
+        self._queue.put(put)
+
+    def _connect(self, channel: SimChannel) -> None:
+        record_name, field_name = channel._address
+        with self._lock:
+            record = self._records.get(record_name)
+            if record is None and self.auto_motors and field_name in _motor_fields:
+                self.add_motor(record_name)
+                record = self._records[record_name]
+            if record is None or field_name not in record.fields:
+                return None
+            if channel not in self._subscribers.get(channel._address, ()):
+                return None
+
+        value = record.fields[field_name]
+        channel._connect(value, self._char_value(record, value), time.time())
+
+    def _detach(self, channel: SimChannel) -> None:
+        with self._lock:
+            channels = self._subscribers.get(channel._address, [])
+            if channel in channels:
+                channels.remove(channel)
+
+    def _publish(self, record: _SimRecord, name: str, value: Any) -> None:
+        """Sets a field and sends it to the channels, runs on the transport thread."""
+        record.fields[name] = value
+        with self._lock:
+            channels = list(self._subscribers.get((record.name, name), ()))
+
+        char_value = self._char_value(record, value)
+        timestamp = time.time()
+        for channel in channels:
+            if channel.connected:
+                channel._update(value, char_value, timestamp)
+
+    @staticmethod
+    def _char_value(record: _SimRecord, value: Any) -> str:
+        if record.enum_strings is not None:
+            return record.enum_strings[value]
+        return str(value)
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+from abc import ABC, abstractmethod
+from epics import ca
+from epics.pv import PV
+from typing import Any
+
+
+class TransportModel(ABC):
+    """
+    Abstract class used to define how the channels of the pool are created.
+
+    A channel follows the part of the pyepics PV interface used by the models:
+    pvname, form, connected, value, char_value, timestamp, connection_callbacks,
+    add_callback, remove_callback, run_callback, get, put, wait_for_connection and
+    disconnect. The monitor and connection callbacks are called with the same
+    keyword arguments as pyepics, from a single transport thread.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def create_channel(self, name: str, form: str, mask: int) -> Any:
+        """Returns a new channel, without waiting for the connection."""
+
+    @abstractmethod
+    def finalize(self, timeout: float) -> None:
+        """Stops the transport, the channels can no longer be used."""
+
+
+class CATransportModel(TransportModel):
+    """Channel Access transport, the channels are pyepics PVs."""
+
+    name = "ca"
+
+    def create_channel(self, name: str, form: str, mask: int) -> PV:
+        return PV(name, form=form, auto_monitor=mask)
+
+    def finalize(self, timeout: float) -> None:
+        ca.finalize_libca(maxtime=timeout)
@@ -18,4 +18,20 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ----------------------------------------------------------------------
 
+import importlib
+
 from vresto.widget.main_widget import MainWidget
+
+# The diagnostics tab is optional, it is imported on first access
+_exports = {
+    "DiagnosticsWidget": "vresto.widget.diagnostics_widget",
+}
+
+
+def __getattr__(name: str):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_exports[name]), name)
+    globals()[name] = value
+    return value
@@ -18,31 +18,51 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ----------------------------------------------------------------------
 
-from qtpy.QtWidgets import QMessageBox
+from qtpy.QtCore import Qt
+from qtpy.QtWidgets import QMessageBox, QWidget
+from typing import List, Optional
 
 
 class MsgBox(QMessageBox):
-    """Custom popup message box widget to expand to the available space."""
-
-    def __init__(self, msg: str):
-        super(MsgBox, self).__init__()
-
-        self.setStyleSheet("QMessageBox, QMessageBox * {"
-                           "background: #222a35;"
-                           "color: #afabab;"
-                           "}"
-                           "QPushButton {"
-                           "background: #344152;"
-                           "color: #e6e6e6;"
-                           "border: 1px solid #e6e6e6;"
-                           "font-family: 'Times New Roman';"
-                           "font-size: 16px;"
-                           "border-radius: 4px;"
-                           "padding: 5px 20px;"
-                           "}"
-                           "QPushButton:hover, QPushButton:focus {"
-                           "background: #e6e6e6;"
-                           "color: #344152;"
-                           "}")
-
-        self.critical(self, "Error", msg, QMessageBox.Ok)
+    """
+    Custom popup message box widget to expand to the available space.
+
+    The message box is styled by the application stylesheet (main.qss). Passing a
+    message shows it as a modal error, while shared returns a single non-modal
+    message box that is created once and reused for every notification.
+    """
+
+    _shared: Optional["MsgBox"] = None
+    _max_lines: int = 10
+
+    def __init__(self, msg: Optional[str] = None, parent: Optional[QWidget] = None):
+        super(MsgBox, self).__init__(parent)
+
+        self._lines: List[str] = []
+
+        self.setIcon(QMessageBox.Critical)
+        self.setWindowTitle("Error")
+        self.setStandardButtons(QMessageBox.Ok)
+
+        if msg is not None:
+            self.setText(msg)
+            self.exec()
+
+    @classmethod
+    def shared(cls, parent: Optional[QWidget] = None) -> "MsgBox":
+        """Returns the shared non-modal message box, creating it on the first call."""
+        if cls._shared is None:
+            cls._shared = cls(parent=parent)
+            cls._shared.setWindowModality(Qt.NonModal)
+            cls._shared.ensurePolished()
+        return cls._shared
+
+    def notify(self, msg: str) -> None:
+        """Shows the message without blocking, appended to the visible ones."""
+        if not self.isVisible():
+            self._lines.clear()
+        self._lines.append(msg)
+        del self._lines[: -self._max_lines]
+
+        self.setText("\n".join(self._lines))
+        self.show()
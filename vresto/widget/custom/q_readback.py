@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import functools
+from qtpy.QtWidgets import QLabel
+from typing import Any, Optional
+
+from vresto.model import PVModel, ReadbackMailboxModel
+
+
+class QReadback(QLabel):
+    """
+    Custom label that shows the readback of a PV, with a placeholder until the first
+    value arrives. Cached values are shown with the stale property set until live
+    data arrives.
+
+    The readbacks go through the shared mailbox, so the label is updated at most at
+    the mailbox rate, and only when the value changes at the displayed precision.
+    """
+
+    def __init__(
+        self,
+        pv: Optional[PVModel] = None,
+        precision: Optional[int] = 4,
+        placeholder: Optional[str] = "----",
+    ) -> None:
+        super(QReadback, self).__init__(placeholder)
+
+        self._pv = None
+        self._precision = precision
+        self._placeholder = placeholder
+
+        # The readback callbacks run from the CA thread, the mailbox delivers on the GUI thread
+        mailbox = ReadbackMailboxModel.shared()
+        key = mailbox.subscribe(self._display)
+        self._post = functools.partial(mailbox.post, key)
+        self.destroyed.connect(functools.partial(mailbox.unsubscribe, key))
+
+        if pv is not None:
+            self.bind(pv)
+
+    def bind(self, pv: PVModel) -> None:
+        """Shows the readback of the given PV, replacing any previous one."""
+        if self._pv is not None:
+            self._pv.remove_readback_callback(self._post)
+
+        self._pv = pv
+        pv.add_readback_callback(self._post)
+        self._display(pv.readback)
+
+    def _display(self, value: Any) -> None:
+        stale = self._pv is not None and self._pv.stale
+        if self.property("stale") != stale:
+            self.setProperty("stale", stale)
+            self.style().unpolish(self)
+            self.style().polish(self)
+
+        if value is None:
+            text = self._placeholder
+        elif isinstance(value, float):
+            text = f"{value:.{self._precision}f}"
+        else:
+            text = str(value)
+
+        # Changes below the displayed precision do not touch the label
+        if text != self.text():
+            self.setText(text)
@@ -18,14 +18,24 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ----------------------------------------------------------------------
 
-from typing import Optional
+from typing import ClassVar, Dict, Optional, Tuple
 from qtpy.QtWidgets import QAbstractButton, QWidget, QSizePolicy
-from qtpy.QtGui import QColor, QPalette, QPainter
-from qtpy.QtCore import QSize, QEvent, Qt, QPropertyAnimation
+from qtpy.QtGui import QBrush, QColor, QPalette, QPainter, QPixmap
+from qtpy.QtCore import Property, QSize, QEvent, Qt, QPropertyAnimation
 
 
 class QSwitch(QAbstractButton):
-    """Custom button that acts like a toggle switch."""
+    """
+    Custom button that acts like a toggle switch. The track and thumb are rendered
+    once per size, state, colors and device pixel ratio, painting only blits them.
+    """
+
+    # Rendered track and thumb pixmaps, shared by all the switches
+    _pixmaps: ClassVar[Dict[Tuple, QPixmap]] = {}
+    _max_pixmaps: ClassVar[int] = 128
+    # Animate the thumb when toggled, disable for remote or low bandwidth displays
+    _animated: ClassVar[bool] = True
+    _animation_duration: ClassVar[int] = 120
 
     def __init__(self,
                  parent: QWidget,
@@ -52,6 +62,9 @@ class QSwitch(QAbstractButton):
         self._configure_switch()
         self._configure_colors()
 
+        self._animation = QPropertyAnimation(self, b"offset", self)
+        self._animation.setDuration(self._animation_duration)
+
     def _configure_switch(self) -> None:
         self.setCheckable(True)
         self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
@@ -92,6 +105,42 @@ class QSwitch(QAbstractButton):
             }
             self._track_opacity = 1
 
+    @classmethod
+    def set_animated(cls, animated: bool) -> None:
+        """Enables or disables the toggle animation of all the switches."""
+        cls._animated = animated
+
+    @classmethod
+    def _pixmap(cls, key: Tuple, size: QSize, ratio: float, draw) -> QPixmap:
+        """Returns the cached pixmap for the key, rendering it with draw if missing."""
+        pixmap = cls._pixmaps.get(key)
+        if pixmap is None:
+            if len(cls._pixmaps) >= cls._max_pixmaps:
+                cls._pixmaps.clear()
+
+            pixmap = QPixmap(round(size.width() * ratio), round(size.height() * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing, True)
+            painter.setPen(Qt.NoPen)
+            draw(painter)
+            painter.end()
+
+            cls._pixmaps[key] = pixmap
+        return pixmap
+
+    def _brushes(self) -> Tuple[QBrush, QBrush, float]:
+        """Returns the track brush, thumb brush and track opacity for the current state."""
+        if self.isEnabled():
+            return (
+                self._track_color[self.isChecked()],
+                self._thumb_color[self.isChecked()],
+                self._track_opacity,
+            )
+        return self.palette().shadow(), self.palette().mid(), self._track_opacity * 0.8
+
     def sizeHint(self) -> QSize:
         return QSize(
             4 * self._track_radius + 2 * self._margin,
@@ -103,38 +152,55 @@ class QSwitch(QAbstractButton):
         self._offset = self._end_offset[self.isChecked()]()
 
     def paintEvent(self, event: QEvent) -> None:
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing, True)
-        painter.setPen(Qt.NoPen)
-        track_opacity = self._track_opacity
-        thumb_opacity = 1.0
-
-        if self.isEnabled():
-            track_brush = self._track_color[self.isChecked()]
-            thumb_brush = self._thumb_color[self.isChecked()]
-        else:
-            track_opacity *= 0.8
-            track_brush = self.palette().shadow()
-            thumb_brush = self.palette().mid()
-
-        painter.setBrush(track_brush)
-        painter.setOpacity(track_opacity)
-        painter.drawRoundedRect(
-            self._margin,
-            self._margin,
-            self.width() - 2 * self._margin,
-            self.height() - 2 * self._margin,
-            self._track_radius,
-            self._track_radius,
+        track_brush, thumb_brush, track_opacity = self._brushes()
+        ratio = self.devicePixelRatioF()
+        size = self.size()
+        thumb_size = QSize(2 * self._thumb_radius, 2 * self._thumb_radius)
+
+        def draw_track(painter: QPainter) -> None:
+            painter.setBrush(track_brush)
+            painter.setOpacity(track_opacity)
+            painter.drawRoundedRect(
+                self._margin,
+                self._margin,
+                size.width() - 2 * self._margin,
+                size.height() - 2 * self._margin,
+                self._track_radius,
+                self._track_radius,
+            )
+
+        def draw_thumb(painter: QPainter) -> None:
+            painter.setBrush(thumb_brush)
+            painter.drawEllipse(0, 0, thumb_size.width(), thumb_size.height())
+
+        track = self._pixmap(
+            (
+                "track",
+                size.width(),
+                size.height(),
+                self._margin,
+                self._track_radius,
+                track_brush.color().rgba(),
+                track_opacity,
+                ratio,
+            ),
+            size,
+            ratio,
+            draw_track,
+        )
+        thumb = self._pixmap(
+            ("thumb", self._thumb_radius, thumb_brush.color().rgba(), ratio),
+            thumb_size,
+            ratio,
+            draw_thumb,
         )
 
-        painter.setBrush(thumb_brush)
-        painter.setOpacity(thumb_opacity)
-        painter.drawEllipse(
-            self._offset - self._thumb_radius,
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, track)
+        painter.drawPixmap(
+            round(self._offset - self._thumb_radius),
             self._base_offset - self._thumb_radius,
-            2 * self._thumb_radius,
-            2 * self._thumb_radius,
+            thumb,
         )
 
     def setChecked(self, checked):
@@ -144,21 +210,25 @@ class QSwitch(QAbstractButton):
     def mouseReleaseEvent(self, event):
         super().mouseReleaseEvent(event)
         if event.button() == Qt.LeftButton:
-            anim = QPropertyAnimation(self, b'offset', self)
-            anim.setDuration(120)
-            anim.setStartValue(self._offset)
-            anim.setEndValue(self._end_offset[self.isChecked()]())
-            anim.start()
+            end_offset = self._end_offset[self.isChecked()]()
+            if self._animated:
+                self._animation.stop()
+                self._animation.setStartValue(self._offset)
+                self._animation.setEndValue(end_offset)
+                self._animation.start()
+            else:
+                self.offset = end_offset
 
     def enterEvent(self, event):
         self.setCursor(Qt.PointingHandCursor)
         super().enterEvent(event)
 
-    @property
-    def offset(self) -> float:
+    def _get_offset(self) -> float:
         return self._offset
 
-    @offset.setter
-    def offset(self, value: float) -> None:
+    def _set_offset(self, value: float) -> None:
         self._offset = value
         self.update()
+
+    # Qt property, so that the toggle animation can drive it
+    offset = Property(float, _get_offset, _set_offset)
@@ -0,0 +1,163 @@
+#!/usr/bin/python3
+# ----------------------------------------------------------------------
+# vresto - Diamond Anvil Cell Corrections GUI software.
+# Author: Christofanis Skordas (skordasc@uchicago.edu)
+# Copyright (C) 2022  GSECARS, The University of Chicago
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ----------------------------------------------------------------------
+
+import time
+from qtpy.QtWidgets import (
+    QAbstractItemView,
+    QHeaderView,
+    QLabel,
+    QGridLayout,
+    QTableWidget,
+    QTableWidgetItem,
+    QWidget,
+)
+from qtpy.QtCore import QTimer, Qt, Signal
+from qtpy.QtGui import QHideEvent, QShowEvent
+
+from vresto.model import Diagnostics
+
+
+class DiagnosticsWidget(QWidget):
+    """
+    Diagnostics tab, shows the latencies and event rates of the PVs, the worker
+    queues, the event loop lag and the memory of the process.
+
+    The refresh signal is emitted at a low rate and the event loop lag is probed
+    only while the tab is visible, a hidden tab has no timers running. The shown
+    signal is emitted before the first refresh every time the tab is shown.
+    """
+
+    shown: Signal = Signal()
+    refresh: Signal = Signal()
+
+    _refresh_interval: int = 1000
+    _lag_interval: int = 100
+    _max_rows: int = 50
+    _columns: tuple = (
+        "PV",
+        "Events/s",
+        "Callback p99 (us)",
+        "Connect (us)",
+        "Put p99 (us)",
+        "Motion p50 (ms)",
+        "Errors",
+    )
+
+    def __init__(self) -> None:
+        super(DiagnosticsWidget, self).__init__()
+
+        self._lbl_loop = QLabel()
+        self._lbl_queues = QLabel()
+        self._lbl_memory = QLabel()
+        self._table = QTableWidget(0, len(self._columns))
+
+        # Timers run only while the tab is visible
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(self._refresh_interval)
+        self._refresh_timer.timeout.connect(self.refresh.emit)
+        self._lag_timer = QTimer(self)
+        self._lag_timer.setInterval(self._lag_interval)
+        self._lag_timer.timeout.connect(self._probe_lag)
+
+        # Event loop lag, the worst since the last refresh
+        self._probed: float = 0.0
+        self._lag: float = 0.0
+
+        self._configure_table()
+        self._configure_layout()
+
+    def _configure_table(self) -> None:
+        self._table.setObjectName("tbl-diagnostics")
+        self._table.setHorizontalHeaderLabels(self._columns)
+        self._table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeToContents
+        )
+        self._table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self._table.verticalHeader().setVisible(False)
+        self._table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self._table.setSelectionMode(QAbstractItemView.NoSelection)
+
+    def _configure_layout(self) -> None:
+        for label in (self._lbl_loop, self._lbl_queues, self._lbl_memory):
+            label.setObjectName("lbl-diagnostics")
+
+        layout = QGridLayout()
+        layout.addWidget(self._lbl_loop, 0, 0, 1, 1)
+        layout.addWidget(self._lbl_queues, 0, 1, 1, 1)
+        layout.addWidget(self._lbl_memory, 0, 2, 1, 1)
+        layout.addWidget(self._table, 1, 0, 1, 3)
+
+        self.setLayout(layout)
+
+    def _probe_lag(self) -> None:
+        """Measures how late the probe timer fires, the time the event loop was busy."""
+        now = time.perf_counter()
+        late = now - self._probed - self._lag_interval / 1000.0
+        self._lag = max(self._lag, late)
+        self._probed = now
+
+    def display(self, diagnostics: Diagnostics) -> None:
+        """Shows a sample of the diagnostics."""
+        self._lbl_loop.setText(f"Event loop lag: {self._lag * 1e3:.1f} ms")
+        self._lag = 0.0
+        self._lbl_queues.setText(
+            f"Worker: {diagnostics.scheduled} jobs | "
+            f"Motions: {diagnostics.motions} running, {diagnostics.sends} to send | "
+            f"Executor: {diagnostics.queued} queued, {diagnostics.active} running"
+        )
+        memory = "-" if diagnostics.memory is None else f"{diagnostics.memory:.0f} MB"
+        self._lbl_memory.setText(f"Memory: {memory}")
+
+        pvs = diagnostics.pvs[: self._max_rows]
+        self._table.setUpdatesEnabled(False)
+        self._table.setRowCount(len(pvs))
+        for row, pv in enumerate(pvs):
+            values = (
+                pv.pv,
+                f"{pv.event_rate:.1f}",
+                str(pv.monitor_p99),
+                str(pv.connect),
+                str(pv.put_p99),
+                f"{pv.motion_p50 / 1e3:.1f}",
+                str(pv.errors),
+            )
+            for column, value in enumerate(values):
+                item = self._table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if column:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    self._table.setItem(row, column, item)
+                item.setText(value)
+        self._table.setUpdatesEnabled(True)
+
+    def showEvent(self, event: QShowEvent) -> None:
+        super(DiagnosticsWidget, self).showEvent(event)
+        self._probed = time.perf_counter()
+        self._lag = 0.0
+        self._lag_timer.start()
+        self._refresh_timer.start()
+        self.shown.emit()
+        self.refresh.emit()
+
+    def hideEvent(self, event: QHideEvent) -> None:
+        super(DiagnosticsWidget, self).hideEvent(event)
+        self._lag_timer.stop()
+        self._refresh_timer.stop()
@@ -18,7 +18,6 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ----------------------------------------------------------------------
 
-import os
 from qtpy.QtWidgets import (
     QMainWindow,
     QTabWidget,
@@ -29,10 +28,12 @@ from qtpy.QtWidgets import (
     QHBoxLayout,
     QVBoxLayout,
 )
-from qtpy.QtCore import QSize
-from qtpy.QtGui import QIcon, QCloseEvent
+from qtpy.QtCore import QSize, Signal
+from qtpy.QtGui import QIcon, QCloseEvent, QPaintEvent
+from typing import Optional
 
 from vresto.model import PathModel
+from vresto.widget.custom import MsgBox
 
 
 class MainWidget(QMainWindow):
@@ -41,7 +42,10 @@ class MainWidget(QMainWindow):
     _size: QSize = QSize(780, 860)
     _hutch: str = ""
 
-    def __init__(self, paths: PathModel) -> None:
+    closing: Signal = Signal()
+    painted: Signal = Signal()
+
+    def __init__(self, paths: PathModel, diagnostics: Optional[bool] = False) -> None:
         super(MainWidget, self).__init__()
 
         self._paths = paths
@@ -51,16 +55,19 @@ class MainWidget(QMainWindow):
         self._main_frame = QFrame()
         self._tab_widget = QTabWidget()
         self.alignment_widget = None
+        self.diagnostics_widget = None
+        if diagnostics:
+            # Imported only when enabled, the tab is not part of the normal startup
+            from vresto.widget.diagnostics_widget import DiagnosticsWidget
+
+            self.diagnostics_widget = DiagnosticsWidget()
         self.lbl_epics_status = QLabel()
         self._lbl_hutch = QLabel(self._hutch)
+        self._painted: bool = False
 
         # Enable the status bar
         self.statusBar()
 
-        # Event helpers
-        self._terminated: bool = False
-        self._worker_finished: bool = False
-
         self._configure_tab_widget()
         self._configure_epics_status_widgets()
         self._configure_main_frame()
@@ -72,12 +79,7 @@ class MainWidget(QMainWindow):
         self.setObjectName("QMainWindow")
 
         # Set the icon
-        self.setWindowIcon(QIcon(os.path.join(self._paths.icon_path, "diamond.png")))
-
-        # Load qss
-        self.setStyleSheet(
-            open(os.path.join(self._paths.qss_path, "main.qss"), "r").read()
-        )
+        self.setWindowIcon(QIcon(self._paths.icon("diamond.png")))
 
         # Set maximum size
         self.setMaximumSize(self._size)
@@ -89,6 +91,8 @@ class MainWidget(QMainWindow):
         """Configures the main tab widget."""
         # Add tabs
         self._tab_widget.addTab(self.alignment_widget, "ALIGNMENT")
+        if self.diagnostics_widget is not None:
+            self._tab_widget.addTab(self.diagnostics_widget, "DIAGNOSTICS")
 
     def _configure_epics_status_widgets(self) -> None:
         """Configures the epics status widgets."""
@@ -124,31 +128,37 @@ class MainWidget(QMainWindow):
 
         self.showNormal()
 
+    def show_notification(self, message: str, level: str) -> None:
+        """
+        Shows a notification on the status bar without blocking. Errors are also
+        collected in the shared non-modal message box, instead of one dialog each.
+        """
+        self.statusBar().showMessage(message, 10000)
+
+        if level == "error":
+            MsgBox.shared(self).notify(message)
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """Emits the painted signal after the first paint of the window."""
+        super(MainWidget, self).paintEvent(event)
+
+        if not self._painted:
+            self._painted = True
+            self.painted.emit()
+
     def closeEvent(self, event: QCloseEvent) -> None:
-        """Creates a message box for exit confirmation if closeEvent is triggered."""
+        """
+        Creates a message box for exit confirmation if closeEvent is triggered.
+
+        On confirmation the closing signal is emitted before the event is accepted,
+        so the connected slots can shut down the application in order.
+        """
         _msg_question = QMessageBox.question(
             self, "Exit confirmation", "Are you sure you want to close the application?"
         )
 
         if _msg_question == QMessageBox.Yes:
-
-            self._terminated = True
-
-            while not self._worker_finished:
-                continue
-
+            self.closing.emit()
             event.accept()
         else:
             event.ignore()
-
-    @property
-    def terminated(self) -> bool:
-        return self._terminated
-
-    @property
-    def worker_finished(self) -> bool:
-        return self._worker_finished
-
-    @worker_finished.setter
-    def worker_finished(self, value: bool) -> None:
-        self._worker_finished = value